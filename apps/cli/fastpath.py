@@ -0,0 +1,132 @@
+"""
+Fast entry point for the Full-Stack Python Kit CLI.
+
+The most common commands (`hello` and `system info`) are parsed with
+argparse and rendered here without importing Typer, Click, httpx or the
+syntax highlighter. Anything else, including `--help`, falls back to the
+full Typer application in `apps.cli.main`.
+"""
+
+import argparse
+import functools
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from rich.console import Console, RenderableType
+from rich.panel import Panel
+from rich.table import Table
+
+
+def build_greeting(name: str, count: int = 1, uppercase: bool = False) -> Optional[RenderableType]:
+    """Build the `hello` output, or None when there is nothing to print."""
+    greeting = f"Hello {name}!"
+    if uppercase:
+        greeting = greeting.upper()
+
+    if count > 1:
+        return "\n".join(
+            f"[bold cyan]{i+1}.[/bold cyan] {greeting}" for i in range(count)
+        )
+    if count == 1:
+        return Panel(greeting, style="bold green")
+    return None
+
+
+@functools.cache
+def _sys_info() -> Dict[str, str]:
+    """Get system and Python details that are fixed for the process lifetime."""
+    return {
+        "Platform": platform.platform(),
+        "System": platform.system(),
+        "Release": platform.release(),
+        "Version": platform.version(),
+        "Machine": platform.machine(),
+        "Processor": platform.processor(),
+        "Python Version": sys.version.split()[0],
+        "Python Implementation": platform.python_implementation(),
+        "Python Executable": sys.executable,
+    }
+
+
+def build_system_info() -> Table:
+    """Build the `system info` table."""
+    table = Table(title="System Information")
+    table.add_column("Property", style="cyan")
+    table.add_column("Value", style="green")
+
+    # System and Python info
+    for prop, value in _sys_info().items():
+        table.add_row(prop, value)
+
+    # Current info
+    table.add_row("Current Directory", os.getcwd())
+    table.add_row("Current Time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    table.add_row("User", os.getenv("USER", "unknown"))
+
+    return table
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the parser for the fast-path commands."""
+    # Help is left to Typer so `--help` output stays the same. Abbreviations
+    # are off because Typer rejects them, and nothing is required: argparse
+    # reports missing arguments by exiting rather than raising, so those
+    # cases are detected after parsing and handed to Typer instead.
+    options = dict(add_help=False, allow_abbrev=False, exit_on_error=False)
+    parser = argparse.ArgumentParser(prog="fspk-cli", **options)
+    commands = parser.add_subparsers(dest="command")
+
+    hello = commands.add_parser("hello", **options)
+    hello.add_argument("name", nargs="?", default="World")
+    hello.add_argument("--count", "-c", type=int, default=1)
+    hello.add_argument("--uppercase", "-u", action="store_true")
+
+    system = commands.add_parser("system", **options)
+    system.add_argument("subcommand", nargs="?", choices=["info"])
+
+    return parser
+
+
+def _try_fast_path(argv: List[str]) -> bool:
+    """Run argv without Typer if it is a fast-path command; return True if handled."""
+    if not argv or argv[0] not in ("hello", "system"):
+        return False
+
+    try:
+        args, unknown = _build_parser().parse_known_args(argv)
+    except argparse.ArgumentError:
+        return False
+
+    # Anything the fast path can't fully handle gets Typer's own output
+    if unknown or (args.command == "system" and args.subcommand is None):
+        return False
+
+    console = Console()
+    if args.command == "hello":
+        output = build_greeting(args.name, args.count, args.uppercase)
+        if output is not None:
+            console.print(output)
+    else:
+        console.print(build_system_info())
+
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if _try_fast_path(argv):
+        return
+
+    from apps.cli.main import app
+
+    app(args=argv, prog_name="fspk-cli")
+
+
+if __name__ == "__main__":
+    main()
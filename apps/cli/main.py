@@ -6,20 +6,28 @@ A comprehensive command-line interface demonstrating the capabilities
 of the Full-Stack Python Kit monorepo.
 """
 
-import json
-import asyncio
+import functools
+import itertools
+import os
+import re
+import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
-from rich.tree import Tree
-import httpx
+from rich.pretty import Pretty
+
+from apps.cli.fastpath import build_greeting, build_system_info
+from apps.shared.jsonx import JSONDecodeError, dumps_pretty, loads
+from apps.shared.timefmt import format_mtime
+
+# Heavy modules are imported inside the commands that use them
+if TYPE_CHECKING:
+    import httpx
+    from rich.syntax import Syntax
 
 app = typer.Typer(
     name="fspk-cli",
@@ -29,6 +37,49 @@ app = typer.Typer(
 
 console = Console()
 
+# Map file extensions to lexer names
+_LEXER_MAP: Dict[str, str] = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.toml': 'toml',
+    '.md': 'markdown',
+    '.html': 'html',
+    '.css': 'css',
+    '.sql': 'sql',
+}
+
+# Environment variable names whose values should be masked
+_SENSITIVE_RE = re.compile(r"PASSWORD|SECRET|KEY|TOKEN", re.IGNORECASE)
+
+# Shared HTTP client so repeated requests reuse pooled keep-alive connections
+_CLIENT: Optional["httpx.AsyncClient"] = None
+
+
+async def get_client(timeout: float, http2: bool = True) -> "httpx.AsyncClient":
+    """Get the shared HTTP client, creating it on first use."""
+    import httpx
+    
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _CLIENT
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
 # Subcommands
 file_app = typer.Typer(name="file", help="File operations")
 api_app = typer.Typer(name="api", help="API testing utilities")
@@ -39,6 +90,14 @@ app.add_typer(api_app, name="api")
 app.add_typer(system_app, name="system")
 
 
+@functools.lru_cache(maxsize=128)
+def _highlight(lang: str, code: str, line_numbers: bool = False) -> "Syntax":
+    """Build a Syntax renderable, reusing it for repeated renders of the same code."""
+    from rich.syntax import Syntax
+    
+    return Syntax(code, lang, theme="monokai", line_numbers=line_numbers)
+
+
 @app.command()
 def hello(
     name: str = typer.Argument("World", help="Name to greet"),
@@ -47,15 +106,9 @@ def hello(
 ) -> None:
     """Say hello to someone with style! 🎉"""
     
-    greeting = f"Hello {name}!"
-    if uppercase:
-        greeting = greeting.upper()
-    
-    for i in range(count):
-        if count > 1:
-            console.print(f"[bold cyan]{i+1}.[/bold cyan] {greeting}")
-        else:
-            console.print(Panel(greeting, style="bold green"))
+    output = build_greeting(name, count, uppercase)
+    if output is not None:
+        console.print(output)
 
 
 @file_app.command("list")
@@ -74,11 +127,12 @@ def list_files(
         console.print(f"[bold red]Error:[/bold red] '{path}' is not a directory")
         raise typer.Exit(1)
     
-    files = []
-    for item in path.iterdir():
-        if not show_hidden and item.name.startswith('.'):
-            continue
-        files.append(item)
+    # DirEntry caches type and stat info from the directory scan
+    with os.scandir(path) as it:
+        files = sorted(
+            (entry for entry in it if show_hidden or not entry.name.startswith('.')),
+            key=lambda entry: entry.name,
+        )
     
     if not files:
         console.print("[yellow]No files found[/yellow]")
@@ -91,18 +145,20 @@ def list_files(
         table.add_column("Size", style="green")
         table.add_column("Modified", style="blue")
         
-        for file in sorted(files):
+        for file in files:
             stat = file.stat()
             file_type = "Directory" if file.is_dir() else "File"
             size = f"{stat.st_size:,} bytes" if file.is_file() else "-"
-            modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+            modified = format_mtime(stat.st_mtime)
             
             table.add_row(file.name, file_type, size, modified)
         
         console.print(table)
     else:
+        from rich.tree import Tree
+        
         tree = Tree(f"📁 {path}")
-        for file in sorted(files):
+        for file in files:
             icon = "📁" if file.is_dir() else "📄"
             tree.add(f"{icon} {file.name}")
         
@@ -126,30 +182,16 @@ def read_file(
         raise typer.Exit(1)
     
     try:
-        content = path.read_text()
-        
         if lines:
-            content = '\n'.join(content.split('\n')[:lines])
+            # Only read the requested prefix instead of loading the whole file
+            with path.open('r', buffering=8192) as f:
+                content = ''.join(itertools.islice(f, lines)).removesuffix('\n')
+        else:
+            content = path.read_text()
         
         if syntax and path.suffix:
-            # Map file extensions to lexer names
-            lexer_map = {
-                '.py': 'python',
-                '.js': 'javascript',
-                '.ts': 'typescript',
-                '.json': 'json',
-                '.yaml': 'yaml',
-                '.yml': 'yaml',
-                '.toml': 'toml',
-                '.md': 'markdown',
-                '.html': 'html',
-                '.css': 'css',
-                '.sql': 'sql',
-            }
-            
-            lexer = lexer_map.get(path.suffix.lower(), 'text')
-            syntax_obj = Syntax(content, lexer, theme="monokai", line_numbers=True)
-            console.print(syntax_obj)
+            lexer = _LEXER_MAP.get(path.suffix.lower(), 'text')
+            console.print(_highlight(lexer, content, line_numbers=True))
         else:
             console.print(content)
             
@@ -164,9 +206,16 @@ def api_get(
     headers: Optional[List[str]] = typer.Option(None, "--header", "-H", help="HTTP headers (key:value)"),
     timeout: float = typer.Option(30.0, "--timeout", "-t", help="Request timeout in seconds"),
     pretty: bool = typer.Option(True, "--pretty/--no-pretty", help="Pretty print JSON response"),
+    http2: bool = typer.Option(True, "--http2/--no-http2", help="Negotiate HTTP/2 when the server supports it"),
+    max_bytes: Optional[int] = typer.Option(None, "--max-bytes", min=1, help="Stop reading the body after this many bytes"),
 ) -> None:
     """Make HTTP GET requests and display responses."""
     
+    import asyncio
+    
+    import httpx
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
     async def fetch_url():
         headers_dict = {}
         if headers:
@@ -175,84 +224,87 @@ def api_get(
                     key, value = header.split(':', 1)
                     headers_dict[key.strip()] = value.strip()
         
-        with Progress(
+        progress = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
-        ) as progress:
-            task = progress.add_task(f"Fetching {url}...", total=None)
+            transient=True,
+        )
+        progress.add_task(f"Fetching {url}...", total=None)
+        
+        # Only show the spinner if the request is still running after 300ms
+        spinner = asyncio.get_running_loop().call_later(0.3, progress.start)
+        
+        try:
+            client = await get_client(timeout, http2=http2)
             
-            try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.get(url, headers=headers_dict)
-                
-                progress.update(task, completed=100)
-                
-                # Display response info
-                status_color = "green" if 200 <= response.status_code < 300 else "red"
-                console.print(f"\n[bold {status_color}]Status:[/bold {status_color}] {response.status_code}")
-                console.print(f"[bold blue]Content-Type:[/bold blue] {response.headers.get('content-type', 'unknown')}")
-                console.print(f"[bold yellow]Content-Length:[/bold yellow] {len(response.content)} bytes\n")
+            # Stream the body so --max-bytes can stop the download early
+            content = bytearray()
+            truncated = False
+            async with client.stream("GET", url, headers=headers_dict, timeout=timeout) as response:
+                async for chunk in response.aiter_bytes(65536):
+                    content += chunk
+                    if max_bytes is not None and len(content) > max_bytes:
+                        truncated = True
+                        del content[max_bytes:]
+                        break
                 
-                # Display response body
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'application/json' in content_type:
-                    try:
-                        json_data = response.json()
-                        if pretty:
-                            formatted_json = json.dumps(json_data, indent=2)
-                            syntax_obj = Syntax(formatted_json, "json", theme="monokai")
-                            console.print(syntax_obj)
-                        else:
-                            console.print(json_data)
-                    except json.JSONDecodeError:
-                        console.print(response.text)
+        except httpx.TimeoutException:
+            console.print(f"[bold red]Error:[/bold red] Request timed out after {timeout} seconds")
+            raise typer.Exit(1)
+        except httpx.RequestError as e:
+            console.print(f"[bold red]Error:[/bold red] Request failed: {e}")
+            raise typer.Exit(1)
+        finally:
+            spinner.cancel()
+            if progress.live.is_started:
+                progress.stop()
+        
+        # Response info
+        status_color = "green" if 200 <= response.status_code < 300 else "red"
+        summary = (
+            f"\n[bold {status_color}]Status:[/bold {status_color}] {response.status_code}\n"
+            f"[bold blue]Content-Type:[/bold blue] {response.headers.get('content-type', 'unknown')}\n"
+            f"[bold yellow]Content-Length:[/bold yellow] {len(content)} bytes"
+            f"{' (truncated)' if truncated else ''}\n"
+        )
+        
+        # Response body
+        content_type = response.headers.get('content-type', '').lower()
+        body: Any = None
+        
+        if 'application/json' in content_type and not truncated:
+            try:
+                json_data = loads(content)
+                if pretty:
+                    formatted_json = dumps_pretty(json_data)
+                    body = _highlight("json", formatted_json)
                 else:
-                    console.print(response.text)
-                    
-            except httpx.TimeoutException:
-                console.print(f"[bold red]Error:[/bold red] Request timed out after {timeout} seconds")
-                raise typer.Exit(1)
-            except httpx.RequestError as e:
-                console.print(f"[bold red]Error:[/bold red] Request failed: {e}")
-                raise typer.Exit(1)
+                    body = Pretty(json_data)
+            except JSONDecodeError:
+                pass
+        
+        if body is None:
+            body = content.decode(response.encoding or "utf-8", errors="replace")
+        
+        # Render everything in a single console write
+        console.print(Group(summary, body))
+    
+    async def run() -> None:
+        # The client is bound to this event loop, so close it before the loop exits
+        try:
+            await fetch_url()
+        finally:
+            await close_client()
     
-    asyncio.run(fetch_url())
+    asyncio.run(run())
 
 
 @system_app.command("info")
 def system_info() -> None:
     """Display system information."""
     
-    import platform
-    import sys
-    import os
-    from datetime import datetime
-    
-    table = Table(title="System Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
-    
-    # System info
-    table.add_row("Platform", platform.platform())
-    table.add_row("System", platform.system())
-    table.add_row("Release", platform.release())
-    table.add_row("Version", platform.version())
-    table.add_row("Machine", platform.machine())
-    table.add_row("Processor", platform.processor())
-    
-    # Python info
-    table.add_row("Python Version", sys.version.split()[0])
-    table.add_row("Python Implementation", platform.python_implementation())
-    table.add_row("Python Executable", sys.executable)
-    
-    # Current info
-    table.add_row("Current Directory", os.getcwd())
-    table.add_row("Current Time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    table.add_row("User", os.getenv("USER", "unknown"))
-    
-    console.print(table)
+    console.print(build_system_info())
 
 
 @system_app.command("env")
@@ -261,8 +313,6 @@ def show_env(
 ) -> None:
     """Display environment variables."""
     
-    import os
-    
     env_vars = dict(os.environ)
     
     if filter_var:
@@ -278,8 +328,8 @@ def show_env(
     
     for key, value in sorted(env_vars.items()):
         # Mask potentially sensitive values
-        if any(sensitive in key.upper() for sensitive in ['PASSWORD', 'SECRET', 'KEY', 'TOKEN']):
-            value = '*' * len(value) if len(value) <= 20 else '*' * 20 + '...'
+        if _SENSITIVE_RE.search(key):
+            value = '*' * min(len(value), 20) + ('...' if len(value) > 20 else '')
         
         table.add_row(key, value)
     
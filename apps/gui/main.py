@@ -7,7 +7,8 @@ the GUI capabilities of the Full-Stack Python Kit.
 """
 
 import asyncio
-import json
+import functools
+import os
 import platform
 import sys
 from datetime import datetime
@@ -17,13 +18,40 @@ from typing import List, Dict, Any, Optional
 from nicegui import ui, app, run
 import httpx
 
+from apps.shared.jsonx import JSONDecodeError, dumps_pretty, loads
+from apps.shared.timefmt import format_mtime
+
+# Shared HTTP client so repeated requests reuse pooled keep-alive connections
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+async def get_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=timeout,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _CLIENT
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
 
 class SystemMonitor:
     """System monitoring utilities."""
     
     @staticmethod
-    def get_system_info() -> Dict[str, str]:
-        """Get comprehensive system information."""
+    @functools.cache
+    def _static_info() -> Dict[str, str]:
+        """Get system details that are fixed for the process lifetime."""
         return {
             "Platform": platform.platform(),
             "System": platform.system(),
@@ -32,6 +60,13 @@ class SystemMonitor:
             "Processor": platform.processor(),
             "Python Version": sys.version.split()[0],
             "Python Implementation": platform.python_implementation(),
+        }
+    
+    @staticmethod
+    def get_system_info() -> Dict[str, str]:
+        """Get comprehensive system information."""
+        return {
+            **SystemMonitor._static_info(),
             "Current Directory": str(Path.cwd()),
             "Current Time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
@@ -46,28 +81,28 @@ class APITester:
     async def make_request(self, url: str, method: str = "GET", headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Make HTTP request and return response data."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=headers or {})
-                else:
-                    raise ValueError(f"Method {method} not supported yet")
-                
-                result = {
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "content": response.text,
-                    "url": str(response.url),
-                    "elapsed": response.elapsed.total_seconds(),
-                }
-                
-                # Try to parse as JSON
-                try:
-                    result["json"] = response.json()
-                except json.JSONDecodeError:
-                    result["json"] = None
-                
-                return result
-                
+            client = await get_client()
+            if method.upper() == "GET":
+                response = await client.get(url, headers=headers or {})
+            else:
+                raise ValueError(f"Method {method} not supported yet")
+            
+            # Try to parse as JSON straight from the raw bytes
+            try:
+                json_data = loads(response.content)
+            except JSONDecodeError:
+                json_data = None
+            
+            return {
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                # JSON bodies are rendered from the parsed data, so skip decoding them
+                "content": response.text if json_data is None else "",
+                "url": str(response.url),
+                "elapsed": response.elapsed.total_seconds(),
+                "json": json_data,
+            }
+            
         except Exception as e:
             return {
                 "error": str(e),
@@ -86,6 +121,17 @@ class FileExplorer:
     def __init__(self):
         self.current_path = Path.cwd()
         
+    def go_up(self) -> None:
+        """Move to the parent of the current directory."""
+        self.current_path = self.current_path.parent
+        
+    def open_entry(self, entry: Dict[str, Any]) -> bool:
+        """Enter a directory entry; return True if the current path changed."""
+        if entry["type"] != "directory":
+            return False
+        self.current_path = Path(entry["path"])
+        return True
+        
     def get_directory_contents(self, path: Path) -> List[Dict[str, Any]]:
         """Get directory contents with metadata."""
         if not path.exists() or not path.is_dir():
@@ -93,18 +139,23 @@ class FileExplorer:
             
         items = []
         try:
-            for item in sorted(path.iterdir()):
-                if item.name.startswith('.'):
-                    continue
-                    
-                stat = item.stat()
+            # DirEntry caches type and stat info from the directory scan
+            with os.scandir(path) as it:
+                entries = sorted(
+                    (entry for entry in it if not entry.name.startswith('.')),
+                    key=lambda entry: entry.name,
+                )
+            
+            for entry in entries:
+                stat = entry.stat()
+                is_dir = entry.is_dir()
                 items.append({
-                    "name": item.name,
-                    "path": str(item),
-                    "type": "directory" if item.is_dir() else "file",
-                    "size": stat.st_size if item.is_file() else None,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
-                    "icon": "📁" if item.is_dir() else "📄",
+                    "name": entry.name,
+                    "path": entry.path,
+                    "type": "directory" if is_dir else "file",
+                    "size": stat.st_size if entry.is_file() else None,
+                    "modified": format_mtime(stat.st_mtime),
+                    "icon": "📁" if is_dir else "📄",
                 })
         except PermissionError:
             pass
@@ -249,8 +300,8 @@ def create_main_layout():
                         """Handle API request."""
                         try:
                             # Parse headers
-                            headers = json.loads(headers_input.value) if headers_input.value.strip() else {}
-                        except json.JSONDecodeError:
+                            headers = loads(headers_input.value) if headers_input.value.strip() else {}
+                        except JSONDecodeError:
                             ui.notify('Invalid JSON in headers', type='negative')
                             return
                         
@@ -283,9 +334,9 @@ def create_main_layout():
                                 ui.label(f'Time: {result["elapsed"]:.2f}s').classes('text-gray-600')
                                 
                                 # Response body
-                                if result['json']:
+                                if result['json'] is not None:
                                     ui.label('Response (JSON):').classes('font-semibold mt-4')
-                                    ui.code(json.dumps(result['json'], indent=2)).classes('w-full')
+                                    ui.code(dumps_pretty(result['json'])).classes('w-full')
                                 else:
                                     ui.label('Response (Text):').classes('font-semibold mt-4')
                                     ui.code(result['content'][:1000] + ('...' if len(result['content']) > 1000 else '')).classes('w-full')
@@ -304,62 +355,65 @@ def create_main_layout():
                 # Current path display
                 current_path_label = ui.label(f'📁 {file_explorer.current_path}').classes('text-lg mb-4')
                 
-                # File list container
-                file_list_container = ui.column().classes('w-full')
+                # Parent directory button (hidden at the filesystem root)
+                async def go_up():
+                    file_explorer.go_up()
+                    await update_file_list()
+                
+                parent_button = ui.button('📁 .. (Parent Directory)', 
+                                         on_click=go_up,
+                                         icon='arrow_upward').classes('w-full text-left mb-2')
+                
+                # File table, paginated so only one page of rows is rendered
+                file_columns = [
+                    {'name': 'icon', 'label': '', 'field': 'icon'},
+                    {'name': 'name', 'label': 'Name', 'field': 'name', 'align': 'left', 'sortable': True},
+                    {'name': 'size', 'label': 'Size', 'field': 'size_label', 'align': 'right'},
+                    {'name': 'modified', 'label': 'Modified', 'field': 'modified', 'sortable': True},
+                ]
+                file_table = ui.table(columns=file_columns, rows=[], row_key='path',
+                                      pagination={'rowsPerPage': 50}).classes('w-full')
+                
+                empty_label = ui.label('No files or directories found').classes('text-gray-500 text-center py-8')
                 
-                def update_file_list():
+                async def handle_row_click(e):
+                    """Open a directory or report the selected file."""
+                    row = e.args[1]
+                    if file_explorer.open_entry(row):
+                        await update_file_list()
+                    else:
+                        # For files, show a notification (could be extended to open/view)
+                        ui.notify(f'Selected file: {row["name"]}', type='info')
+                
+                file_table.on('rowClick', handle_row_click)
+                
+                async def update_file_list():
                     """Update the file list display."""
-                    file_list_container.clear()
-                    current_path_label.text = f'📁 {file_explorer.current_path}'
-                    
-                    # Parent directory button (if not root)
-                    if file_explorer.current_path.parent != file_explorer.current_path:
-                        with file_list_container:
-                            def go_up():
-                                file_explorer.current_path = file_explorer.current_path.parent
-                                update_file_list()
-                            
-                            ui.button('📁 .. (Parent Directory)', 
-                                     on_click=go_up,
-                                     icon='arrow_upward').classes('w-full text-left mb-2')
-                    
-                    # Directory contents
-                    contents = file_explorer.get_directory_contents(file_explorer.current_path)
+                    path = file_explorer.current_path
+                    current_path_label.text = f'📁 {path}'
+                    parent_button.set_visibility(path.parent != path)
                     
-                    if not contents:
-                        with file_list_container:
-                            ui.label('No files or directories found').classes('text-gray-500 text-center py-8')
+                    # Scan in a worker thread so slow filesystems don't block the UI
+                    contents = await run.io_bound(file_explorer.get_directory_contents, path)
+                    if path != file_explorer.current_path:
+                        # The user navigated elsewhere while this scan was running
                         return
+                    for item in contents:
+                        size = item['size']
+                        if item['type'] != 'file' or size is None:
+                            item['size_label'] = ''
+                        elif size < 1024:
+                            item['size_label'] = f"{size:,} bytes"
+                        else:
+                            item['size_label'] = f"{size//1024:,} KB"
                     
-                    # Create file/directory buttons
-                    with file_list_container:
-                        for item in contents:
-                            def create_click_handler(item_path: str, is_dir: bool):
-                                def handle_click():
-                                    if is_dir:
-                                        file_explorer.current_path = Path(item_path)
-                                        update_file_list()
-                                    else:
-                                        # For files, show a notification (could be extended to open/view)
-                                        ui.notify(f'Selected file: {Path(item_path).name}', type='info')
-                                return handle_click
-                            
-                            with ui.row().classes('w-full items-center gap-2 p-2 hover:bg-gray-100 rounded'):
-                                ui.label(item['icon']).classes('text-xl')
-                                
-                                button_text = f"{item['name']}"
-                                if item['type'] == 'file' and item['size'] is not None:
-                                    size_str = f" ({item['size']:,} bytes)" if item['size'] < 1024 else f" ({item['size']//1024:,} KB)"
-                                    button_text += size_str
-                                
-                                ui.button(button_text,
-                                         on_click=create_click_handler(item['path'], item['type'] == 'directory'),
-                                         color=None).classes('flex-1 text-left justify-start')
-                                
-                                ui.label(item['modified']).classes('text-sm text-gray-500 min-w-fit')
+                    file_table.rows = contents
+                    file_table.update()
+                    file_table.set_visibility(bool(contents))
+                    empty_label.set_visibility(not contents)
                 
-                # Initial file list
-                update_file_list()
+                # Initial file list, loaded once the event loop is running
+                ui.timer(0, update_file_list, once=True)
 
 
 def main():
@@ -372,6 +426,9 @@ def main():
     app.native.window_args['resizable'] = True
     app.native.start_args['debug'] = False
     
+    # Release pooled HTTP connections when the app stops
+    app.on_shutdown(close_client)
+    
     # Create the main layout
     create_main_layout()
     
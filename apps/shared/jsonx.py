@@ -0,0 +1,19 @@
+"""
+Fast JSON helpers shared by the CLI and GUI applications.
+"""
+
+from typing import Any
+
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from bytes or a string."""
+    return orjson.loads(data)
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize an object to a two-space indented JSON string."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
@@ -0,0 +1,13 @@
+"""
+Timestamp formatting helpers shared by the CLI and GUI applications.
+"""
+
+import time
+
+
+def format_mtime(mtime: float) -> str:
+    """Format a file modification time as local 'YYYY-MM-DD HH:MM'."""
+    # Plain integer formatting avoids building a datetime and parsing a
+    # strftime format for every directory entry
+    t = time.localtime(mtime)
+    return f"{t.tm_year}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}"
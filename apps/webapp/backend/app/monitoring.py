@@ -2,11 +2,23 @@
 Monitoring and observability setup for the Full-Stack Python Kit API.
 """
 
-import time
-from typing import Dict, Any
+import asyncio
+import os
+from time import perf_counter
+from typing import Any, Dict, Iterable, Set, Tuple
 
-from fastapi import FastAPI, Request, Response
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Response
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from packages.core.logging import get_logger
 
@@ -31,54 +43,147 @@ API_ERRORS = Counter(
     ['error_type', 'endpoint']
 )
 
+# Endpoint label for requests that did not match any route (e.g. 404 scans)
+UNMATCHED_ENDPOINT = "<unmatched>"
 
-def setup_monitoring(app: FastAPI) -> None:
-    """Setup monitoring and metrics collection."""
+# Bound metric children, so labels() is resolved once per label set rather
+# than on every request
+_REQUEST_COUNT_CHILDREN: Dict[Tuple[str, str, int], Any] = {}
+_REQUEST_DURATION_CHILDREN: Dict[Tuple[str, str], Any] = {}
+
+
+def get_metrics_registry() -> CollectorRegistry:
+    """Get the registry served by /metrics.
     
-    @app.middleware("http")
-    async def monitoring_middleware(request: Request, call_next):
-        """Collect metrics for each request."""
-        start_time = time.time()
-        
-        # Process the request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Get endpoint path template
-        endpoint = request.url.path
-        if hasattr(request, 'path_info'):
-            endpoint = request.path_info
+    When PROMETHEUS_MULTIPROC_DIR is set (multiple worker processes), the
+    metrics of all workers are aggregated from that directory; otherwise
+    this process's default registry is used.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class PrometheusASGIMiddleware:
+    """Pure ASGI middleware that collects request metrics.
+    
+    Unlike ``@app.middleware("http")`` this does not go through Starlette's
+    ``BaseHTTPMiddleware``, so no extra task and memory stream are created
+    per request.
+    """
+    
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = ()) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
         
-        # Record metrics
-        REQUEST_COUNT.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status_code=response.status_code
-        ).inc()
+        start_time = perf_counter()
+        status_code = 500
         
-        REQUEST_DURATION.labels(
-            method=request.method,
-            endpoint=endpoint
-        ).observe(duration)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        # Log slow requests
-        if duration > 1.0:  # Log requests taking more than 1 second
-            logger.warning(
-                "Slow request detected",
-                method=request.method,
-                endpoint=endpoint,
-                duration=duration,
-                status_code=response.status_code
-            )
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Calculate duration
+            duration = perf_counter() - start_time
+            
+            method = scope["method"]
+            
+            # Label by route template (e.g. /notes/{note_id}) to keep cardinality
+            # bounded; requests that matched no route share a single label
+            route = scope.get("route")
+            endpoint = route.path if route is not None else UNMATCHED_ENDPOINT
+            
+            # Record metrics
+            count_key = (method, endpoint, status_code)
+            request_count = _REQUEST_COUNT_CHILDREN.get(count_key)
+            if request_count is None:
+                request_count = REQUEST_COUNT.labels(*count_key)
+                _REQUEST_COUNT_CHILDREN[count_key] = request_count
+            request_count.inc()
+            
+            duration_key = (method, endpoint)
+            request_duration = _REQUEST_DURATION_CHILDREN.get(duration_key)
+            if request_duration is None:
+                request_duration = REQUEST_DURATION.labels(*duration_key)
+                _REQUEST_DURATION_CHILDREN[duration_key] = request_duration
+            request_duration.observe(duration)
+            
+            # Log slow requests
+            if duration > 1.0:  # Log requests taking more than 1 second
+                logger.warning(
+                    "Slow request detected",
+                    method=method,
+                    endpoint=endpoint,
+                    duration=duration,
+                    status_code=status_code
+                )
+
+
+def _excluded_paths(app: FastAPI) -> Set[str]:
+    """Paths that are not instrumented: scrapes, health probes and the API docs."""
+    exclude_paths = {"/metrics", "/health", "/health/detailed"}
+    exclude_paths.update(
+        path
+        for path in (
+            app.openapi_url,
+            app.docs_url,
+            app.redoc_url,
+            app.swagger_ui_oauth2_redirect_url,
+        )
+        if path
+    )
+    return exclude_paths
+
+
+def preallocate_route_metrics(app: FastAPI) -> None:
+    """Bind the request duration metric for every API route up front.
+    
+    Call once all routers are included. Besides saving the first request on
+    each route the labels() lookup, this exports a zero-valued series per
+    route so rates are defined before the route is first hit.
+    """
+    exclude_paths = _excluded_paths(app)
+    
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.path in exclude_paths:
+            continue
         
-        return response
+        for method in route.methods:
+            key = (method, route.path)
+            if key not in _REQUEST_DURATION_CHILDREN:
+                _REQUEST_DURATION_CHILDREN[key] = REQUEST_DURATION.labels(*key)
+
+
+def setup_monitoring(app: FastAPI) -> None:
+    """Setup monitoring and metrics collection.
+    
+    Must be called before the application starts, since middleware cannot
+    be added to a running application.
+    """
+    
+    app.add_middleware(PrometheusASGIMiddleware, exclude_paths=_excluded_paths(app))
+    
+    registry = get_metrics_registry()
     
     @app.get("/metrics")
     async def get_metrics():
         """Prometheus metrics endpoint."""
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        # Serialize in a worker thread so large scrapes don't block the event loop
+        payload = await asyncio.to_thread(generate_latest, registry)
+        return Response(payload, media_type=CONTENT_TYPE_LATEST)
     
     @app.get("/health/detailed")
     async def detailed_health_check() -> Dict[str, Any]:
@@ -7,20 +7,39 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import exists
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from packages.core.config import get_settings
 from packages.database.session import get_db
 from packages.database.models import User, UserCreate, UserRead
-from packages.auth.auth import create_access_token, get_current_user
-from packages.auth.password import verify_password, hash_password
+from packages.auth.auth import create_access_token, get_current_user, invalidate_cached_user
+from packages.auth.password import verify_password_async, hash_password_async
 from packages.core.logging import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def _registration_conflict(db: AsyncSession, user_data: UserCreate) -> str | None:
+    """Return why the email or username can't be registered, if either is taken."""
+    is_taken = (User.email == user_data.email) | (User.username == user_data.username)
+    if not await db.scalar(select(exists().where(is_taken))):
+        return None
+    
+    # Find out which field conflicted
+    statement = select(exists().where(User.email == user_data.email))
+    if await db.scalar(statement):
+        return "Email already registered"
+    return "Username already taken"
+
 
 @router.post("/login")
 async def login(
@@ -36,7 +55,7 @@ async def login(
     result = await db.execute(statement)
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         logger.warning("Failed login attempt", username=form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,7 +81,7 @@ async def login(
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": settings.access_token_expire_minutes * 60,
-        "user": UserRead.from_orm(user),
+        "user": UserRead.model_validate(user),
     }
 
 
@@ -73,27 +92,12 @@ async def register(
 ) -> User:
     """Register a new user."""
     
-    # Check if user already exists
-    statement = select(User).where(
-        (User.email == user_data.email) | (User.username == user_data.username)
-    )
-    result = await db.execute(statement)
-    existing_user = result.scalar_one_or_none()
-    
-    if existing_user:
-        if existing_user.email == user_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
-            )
-    
-    # Create new user
-    hashed_password = hash_password(user_data.password)
+    # Cheap check first so duplicates don't pay for hashing
+    detail = await _registration_conflict(db, user_data)
+    if detail:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    
+    hashed_password = await hash_password_async(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -104,13 +108,31 @@ async def register(
         is_verified=False,
     )
     
-    db.add(new_user)
+    # Skip, rather than fail on, a duplicate registered since the check above
+    insert = _UPSERT_INSERTS.get(db.bind.dialect.name)
+    if insert is not None:
+        statement = insert(User).values(**new_user.model_dump()).on_conflict_do_nothing().returning(User)
+        result = await db.execute(statement)
+        created_user = result.scalar_one_or_none()
+    else:
+        # Other dialects report the duplicate as an IntegrityError instead
+        db.add(new_user)
+        try:
+            await db.flush()
+            created_user = new_user
+        except IntegrityError:
+            await db.rollback()
+            created_user = None
+    
+    if created_user is None:
+        detail = await _registration_conflict(db, user_data) or "Username already taken"
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    
     await db.commit()
-    await db.refresh(new_user)
     
-    logger.info("New user registered", user_id=str(new_user.id), username=new_user.username)
+    logger.info("New user registered", user_id=str(created_user.id), username=created_user.username)
     
-    return new_user
+    return created_user
 
 
 @router.get("/me", response_model=UserRead)
@@ -128,6 +150,7 @@ async def logout(
     """Logout current user."""
     # In a real application, you might want to blacklist the token
     # For now, we'll just return a success message
+    invalidate_cached_user(current_user.id)
     logger.info("User logged out", user_id=str(current_user.id))
     return {"message": "Successfully logged out"}
 
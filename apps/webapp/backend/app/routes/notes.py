@@ -2,16 +2,17 @@
 Note management routes for the Full-Stack Python Kit API.
 """
 
-import json
 from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, and_
+from sqlmodel import select, and_, func, true
 
 from packages.database.session import get_db
 from packages.database.models import Note, NoteCreate, NoteRead, NoteUpdate, User
+from packages.database.functions import has_tag, text_search, word_count
 from packages.auth.auth import get_current_user
 from packages.core.logging import get_logger
 
@@ -34,14 +35,11 @@ async def get_notes(
     
     # Add search condition
     if search:
-        search_condition = Note.title.ilike(f"%{search}%") | Note.content.ilike(f"%{search}%")
-        conditions.append(search_condition)
+        conditions.append(text_search(Note.title, Note.content, search))
     
     # Add tag filter
     if tag:
-        # Simple tag filtering - in a real app, you might use a proper tag system
-        tag_condition = Note.tags.ilike(f"%{tag}%")
-        conditions.append(tag_condition)
+        conditions.append(has_tag(Note.tags, tag))
     
     statement = select(Note).where(and_(*conditions)).offset(skip).limit(limit).order_by(Note.updated_at.desc())
     result = await db.execute(statement)
@@ -58,25 +56,13 @@ async def create_note(
 ) -> Note:
     """Create a new note."""
     
-    # Validate tags if provided
-    if note_data.tags:
-        try:
-            # Ensure tags is valid JSON
-            json.loads(note_data.tags)
-        except json.JSONDecodeError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Tags must be valid JSON"
-            )
-    
     new_note = Note(
-        **note_data.dict(),
+        **note_data.model_dump(),
         user_id=current_user.id
     )
     
     db.add(new_note)
     await db.commit()
-    await db.refresh(new_note)
     
     logger.info("Note created", note_id=str(new_note.id), user_id=str(current_user.id))
     
@@ -127,18 +113,8 @@ async def update_note(
             detail="Note not found"
         )
     
-    # Validate tags if provided
-    if note_update.tags is not None:
-        try:
-            json.loads(note_update.tags)
-        except json.JSONDecodeError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Tags must be valid JSON"
-            )
-    
     # Update note fields
-    update_data = note_update.dict(exclude_unset=True)
+    update_data = note_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(note, field, value)
     
@@ -158,19 +134,17 @@ async def delete_note(
 ) -> dict[str, str]:
     """Delete a note."""
     
-    statement = select(Note).where(
+    statement = delete(Note).where(
         and_(Note.id == note_id, Note.user_id == current_user.id)
-    )
+    ).returning(Note.id)
     result = await db.execute(statement)
-    note = result.scalar_one_or_none()
     
-    if not note:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Note not found"
         )
     
-    await db.delete(note)
     await db.commit()
     
     logger.info("Note deleted", note_id=str(note_id), user_id=str(current_user.id))
@@ -185,24 +159,19 @@ async def get_all_tags(
 ) -> List[str]:
     """Get all unique tags for the current user."""
     
-    statement = select(Note.tags).where(
-        and_(Note.user_id == current_user.id, Note.tags.is_not(None))
-    )
-    result = await db.execute(statement)
-    tag_strings = result.scalars().all()
-    
-    # Extract individual tags from JSON strings
-    all_tags = set()
-    for tag_string in tag_strings:
-        if tag_string:
-            try:
-                tags = json.loads(tag_string)
-                if isinstance(tags, list):
-                    all_tags.update(tags)
-            except json.JSONDecodeError:
-                continue
+    # Expand the tag arrays in the database and return each tag once
+    if db.bind.dialect.name == "postgresql":
+        tag = func.unnest(Note.tags).label("tag")
+        statement = select(tag).where(Note.user_id == current_user.id)
+    else:
+        tag_values = func.json_each(Note.tags).table_valued("value")
+        tag = tag_values.c.value
+        statement = select(tag).select_from(Note).join(tag_values, true()).where(
+            Note.user_id == current_user.id
+        )
     
-    return sorted(list(all_tags))
+    result = await db.execute(statement.distinct().order_by(tag))
+    return list(result.scalars().all())
 
 
 @router.get("/stats/summary")
@@ -212,24 +181,19 @@ async def get_note_stats(
 ) -> dict[str, int]:
     """Get note statistics for the current user."""
     
-    # Total notes
-    total_statement = select(Note).where(Note.user_id == current_user.id)
-    total_result = await db.execute(total_statement)
-    total_notes = len(total_result.scalars().all())
-    
-    # Notes with tags
-    tagged_statement = select(Note).where(
-        and_(Note.user_id == current_user.id, Note.tags.is_not(None))
+    # Total and tagged notes (COUNT of a column skips NULLs)
+    count_statement = select(func.count(), func.count(Note.tags)).where(
+        Note.user_id == current_user.id
     )
-    tagged_result = await db.execute(tagged_statement)
-    tagged_notes = len(tagged_result.scalars().all())
-    
-    # Total word count (approximate)
-    all_notes_statement = select(Note.content).where(Note.user_id == current_user.id)
-    all_notes_result = await db.execute(all_notes_statement)
-    all_content = all_notes_result.scalars().all()
+    count_result = await db.execute(count_statement)
+    total_notes, tagged_notes = count_result.one()
     
-    total_words = sum(len(content.split()) for content in all_content if content)
+    # Total word count, computed in the database
+    words_statement = select(func.coalesce(func.sum(word_count(Note.content)), 0)).where(
+        Note.user_id == current_user.id
+    )
+    words_result = await db.execute(words_statement)
+    total_words = words_result.scalar_one()
     
     return {
         "total_notes": total_notes,
@@ -2,15 +2,16 @@
 Task management routes for the Full-Stack Python Kit API.
 """
 
-from typing import List, Optional
+from typing import List, Optional, get_args
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import delete, not_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, and_
+from sqlmodel import select, and_, func
 
 from packages.database.session import get_db
-from packages.database.models import Task, TaskCreate, TaskRead, TaskUpdate, User
+from packages.database.models import Priority, Task, TaskCreate, TaskRead, TaskUpdate, User
 from packages.auth.auth import get_current_user
 from packages.core.logging import get_logger
 
@@ -23,7 +24,7 @@ async def get_tasks(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     completed: Optional[bool] = Query(None),
-    priority: Optional[str] = Query(None),
+    priority: Optional[Priority] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> List[Task]:
@@ -52,22 +53,13 @@ async def create_task(
 ) -> Task:
     """Create a new task."""
     
-    # Validate priority
-    valid_priorities = ["low", "medium", "high"]
-    if task_data.priority not in valid_priorities:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Priority must be one of: {', '.join(valid_priorities)}"
-        )
-    
     new_task = Task(
-        **task_data.dict(),
+        **task_data.model_dump(),
         user_id=current_user.id
     )
     
     db.add(new_task)
     await db.commit()
-    await db.refresh(new_task)
     
     logger.info("Task created", task_id=str(new_task.id), user_id=str(current_user.id))
     
@@ -118,17 +110,8 @@ async def update_task(
             detail="Task not found"
         )
     
-    # Validate priority if provided
-    if task_update.priority is not None:
-        valid_priorities = ["low", "medium", "high"]
-        if task_update.priority not in valid_priorities:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Priority must be one of: {', '.join(valid_priorities)}"
-            )
-    
     # Update task fields
-    update_data = task_update.dict(exclude_unset=True)
+    update_data = task_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
     
@@ -148,19 +131,17 @@ async def delete_task(
 ) -> dict[str, str]:
     """Delete a task."""
     
-    statement = select(Task).where(
+    statement = delete(Task).where(
         and_(Task.id == task_id, Task.user_id == current_user.id)
-    )
+    ).returning(Task.id)
     result = await db.execute(statement)
-    task = result.scalar_one_or_none()
     
-    if not task:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    await db.delete(task)
     await db.commit()
     
     logger.info("Task deleted", task_id=str(task_id), user_id=str(current_user.id))
@@ -176,8 +157,13 @@ async def toggle_task_completion(
 ) -> Task:
     """Toggle task completion status."""
     
-    statement = select(Task).where(
-        and_(Task.id == task_id, Task.user_id == current_user.id)
+    # Flip the flag in the database and return the updated row in one statement
+    statement = (
+        update(Task)
+        .where(and_(Task.id == task_id, Task.user_id == current_user.id))
+        .values(completed=not_(Task.completed))
+        .returning(Task)
+        .execution_options(populate_existing=True)
     )
     result = await db.execute(statement)
     task = result.scalar_one_or_none()
@@ -188,9 +174,7 @@ async def toggle_task_completion(
             detail="Task not found"
         )
     
-    task.completed = not task.completed
     await db.commit()
-    await db.refresh(task)
     
     logger.info(
         "Task completion toggled", 
@@ -209,26 +193,26 @@ async def get_task_stats(
 ) -> dict[str, int]:
     """Get task statistics for the current user."""
     
-    # Total tasks
-    total_statement = select(Task).where(Task.user_id == current_user.id)
-    total_result = await db.execute(total_statement)
-    total_tasks = len(total_result.scalars().all())
-    
-    # Completed tasks
-    completed_statement = select(Task).where(
-        and_(Task.user_id == current_user.id, Task.completed == True)
+    # Count tasks per (priority, completed) pair in a single query
+    statement = (
+        select(Task.priority, Task.completed, func.count())
+        .where(Task.user_id == current_user.id)
+        .group_by(Task.priority, Task.completed)
     )
-    completed_result = await db.execute(completed_statement)
-    completed_tasks = len(completed_result.scalars().all())
-    
-    # Priority breakdown
-    priority_stats = {}
-    for priority in ["low", "medium", "high"]:
-        priority_statement = select(Task).where(
-            and_(Task.user_id == current_user.id, Task.priority == priority, Task.completed == False)
-        )
-        priority_result = await db.execute(priority_statement)
-        priority_stats[f"{priority}_priority"] = len(priority_result.scalars().all())
+    result = await db.execute(statement)
+    
+    total_tasks = 0
+    completed_tasks = 0
+    
+    # Priority breakdown of pending tasks
+    priority_stats = {f"{priority}_priority": 0 for priority in get_args(Priority)}
+    
+    for priority, completed, count in result.all():
+        total_tasks += count
+        if completed:
+            completed_tasks += count
+        elif f"{priority}_priority" in priority_stats:
+            priority_stats[f"{priority}_priority"] += count
     
     return {
         "total_tasks": total_tasks,
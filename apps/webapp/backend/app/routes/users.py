@@ -6,12 +6,13 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from packages.database.session import get_db
 from packages.database.models import User, UserRead, UserUpdate
-from packages.auth.auth import get_current_user, get_current_superuser
+from packages.auth.auth import get_current_user, get_current_superuser, invalidate_cached_user
 from packages.core.logging import get_logger
 
 router = APIRouter()
@@ -90,30 +91,29 @@ async def update_user(
     
     # Check for unique constraints
     if user_update.email and user_update.email != user.email:
-        email_check = select(User).where(User.email == user_update.email)
-        email_result = await db.execute(email_check)
-        if email_result.scalar_one_or_none():
+        email_check = select(exists().where(User.email == user_update.email))
+        if await db.scalar(email_check):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
     
     if user_update.username and user_update.username != user.username:
-        username_check = select(User).where(User.username == user_update.username)
-        username_result = await db.execute(username_check)
-        if username_result.scalar_one_or_none():
+        username_check = select(exists().where(User.username == user_update.username))
+        if await db.scalar(username_check):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
     
     # Update user fields
-    update_data = user_update.dict(exclude_unset=True)
+    update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user, field, value)
     
     await db.commit()
     await db.refresh(user)
+    invalidate_cached_user(user.id)
     
     logger.info("User updated", user_id=str(user.id), updated_by=str(current_user.id))
     
@@ -128,16 +128,6 @@ async def delete_user(
 ) -> dict[str, str]:
     """Delete a user (superuser only)."""
     
-    statement = select(User).where(User.id == user_id)
-    result = await db.execute(statement)
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
     # Don't allow deleting yourself
     if user_id == current_user.id:
         raise HTTPException(
@@ -145,9 +135,18 @@ async def delete_user(
             detail="Cannot delete yourself"
         )
     
-    await db.delete(user)
+    statement = delete(User).where(User.id == user_id).returning(User.id)
+    result = await db.execute(statement)
+    
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
     await db.commit()
+    invalidate_cached_user(user_id)
     
-    logger.info("User deleted", user_id=str(user.id), deleted_by=str(current_user.id))
+    logger.info("User deleted", user_id=str(user_id), deleted_by=str(current_user.id))
     
     return {"message": "User deleted successfully"}
\ No newline at end of file
@@ -2,10 +2,15 @@
 WebSocket routes for real-time features in the Full-Stack Python Kit API.
 """
 
-import json
-from typing import Dict, Set
-from uuid import UUID
+import asyncio
+import functools
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
 
+import msgpack
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
 from fastapi.exceptions import WebSocketException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,78 +23,249 @@ router = APIRouter()
 logger = get_logger(__name__)
 
 
+# Errors raised when sending to a client that has gone away; the server
+# wraps protocol-level ConnectionClosed in one of these
+_SEND_ERRORS = (WebSocketDisconnect, RuntimeError, OSError)
+
+
+# Clients that ask for this subprotocol get fan-out messages as msgpack
+# binary frames; everything else is JSON text
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    """Serialize a message for a text frame."""
+    return orjson.dumps(message).decode()
+
+
+def _packb(message: Dict[str, Any]) -> bytes:
+    """Serialize a message for a msgpack binary frame."""
+    return msgpack.packb(message, default=str)
+
+
+# Message timestamps are reformatted at most this often (seconds)
+_TIMESTAMP_INTERVAL = 0.05
+_timestamp = ""
+_timestamp_refreshed_at = float("-inf")
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO 8601, shared by all messages within an interval."""
+    global _timestamp, _timestamp_refreshed_at
+    
+    now = time.monotonic()
+    if now - _timestamp_refreshed_at >= _TIMESTAMP_INTERVAL:
+        now_utc = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        _timestamp = now_utc.replace("+00:00", "Z")
+        _timestamp_refreshed_at = now
+    
+    return _timestamp
+
+
+# Frames whose content never changes are serialized once
+_INVALID_JSON_FRAME = _dumps({"type": "error", "message": "Invalid JSON format"})
+
+# The pong frame is pre-serialized around its timestamp, which needs no
+# JSON escaping, so replying only concatenates strings
+_PONG_FRAME_PREFIX, _PONG_FRAME_SUFFIX = _dumps(
+    {"type": "pong", "timestamp": "TIMESTAMP"}
+).split("TIMESTAMP")
+
+
+class Connection:
+    """An open WebSocket and its identifiers, pre-formatted for logging."""
+    
+    __slots__ = ("websocket", "use_msgpack", "user_key", "user_id_str", "connection_id_str")
+    
+    def __init__(
+        self, websocket: WebSocket, user_id: UUID, connection_id: UUID, use_msgpack: bool = False
+    ):
+        self.websocket = websocket
+        self.use_msgpack = use_msgpack
+        self.user_key = user_id.int
+        self.user_id_str = str(user_id)
+        self.connection_id_str = str(connection_id)
+
+
 class ConnectionManager:
-    """Manages WebSocket connections."""
+    """Manages WebSocket connections.
+    
+    Connections are keyed by the integer value of their UUIDs, which hash
+    faster than UUID objects. Broadcasts walk parallel lists of sockets and
+    keys rather than the connection dict; removal swaps the last entry into
+    the gap so the lists stay dense.
+    """
+    
+    __slots__ = (
+        "active_connections",
+        "user_connections",
+        "_websockets",
+        "_connection_keys",
+        "_use_msgpack",
+        "_positions",
+    )
     
     def __init__(self):
-        self.active_connections: Dict[UUID, WebSocket] = {}
-        self.user_connections: Dict[UUID, Set[UUID]] = {}
+        self.active_connections: Dict[int, Connection] = {}
+        self.user_connections: Dict[int, Dict[int, Connection]] = {}
+        self._websockets: List[WebSocket] = []
+        self._connection_keys: List[int] = []
+        self._use_msgpack: List[bool] = []
+        self._positions: Dict[int, int] = {}
     
     async def connect(self, websocket: WebSocket, user_id: UUID, connection_id: UUID):
-        """Connect a new WebSocket."""
-        await websocket.accept()
-        self.active_connections[connection_id] = websocket
+        """Connect a new WebSocket, agreeing to msgpack framing if the client asked for it."""
+        use_msgpack = MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", ())
+        await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if use_msgpack else None)
+        connection = Connection(websocket, user_id, connection_id, use_msgpack)
+        self.active_connections[connection_id.int] = connection
+        
+        self._positions[connection_id.int] = len(self._websockets)
+        self._websockets.append(websocket)
+        self._connection_keys.append(connection_id.int)
+        self._use_msgpack.append(use_msgpack)
         
-        if user_id not in self.user_connections:
-            self.user_connections[user_id] = set()
-        self.user_connections[user_id].add(connection_id)
+        self.user_connections.setdefault(connection.user_key, {})[connection_id.int] = connection
         
-        logger.info("WebSocket connected", user_id=str(user_id), connection_id=str(connection_id))
+        logger.info(
+            "WebSocket connected",
+            user_id=connection.user_id_str,
+            connection_id=connection.connection_id_str,
+        )
     
     def disconnect(self, user_id: UUID, connection_id: UUID):
         """Disconnect a WebSocket."""
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
+        self._remove(connection_id.int)
+    
+    def _remove(self, connection_key: int):
+        """Forget a connection by its key."""
+        connection = self.active_connections.pop(connection_key, None)
+        if connection is None:
+            return
+        
+        position = self._positions.pop(connection_key)
+        last_websocket = self._websockets.pop()
+        last_key = self._connection_keys.pop()
+        last_use_msgpack = self._use_msgpack.pop()
+        if position < len(self._websockets):
+            self._websockets[position] = last_websocket
+            self._connection_keys[position] = last_key
+            self._use_msgpack[position] = last_use_msgpack
+            self._positions[last_key] = position
         
-        if user_id in self.user_connections:
-            self.user_connections[user_id].discard(connection_id)
-            if not self.user_connections[user_id]:
-                del self.user_connections[user_id]
+        user_connections = self.user_connections.get(connection.user_key)
+        if user_connections is not None:
+            user_connections.pop(connection_key, None)
+            if not user_connections:
+                del self.user_connections[connection.user_key]
         
-        logger.info("WebSocket disconnected", user_id=str(user_id), connection_id=str(connection_id))
+        logger.info(
+            "WebSocket disconnected",
+            user_id=connection.user_id_str,
+            connection_id=connection.connection_id_str,
+        )
     
-    async def send_personal_message(self, message: str, connection_id: UUID):
+    async def send_personal_message(self, message: Dict[str, Any], connection_id: UUID):
         """Send a message to a specific connection."""
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
-            await websocket.send_text(message)
+        connection = self.active_connections.get(connection_id.int)
+        if connection is None:
+            return
+        
+        if connection.use_msgpack:
+            await connection.websocket.send_bytes(_packb(message))
+        else:
+            await connection.websocket.send_text(_dumps(message))
     
-    async def send_user_message(self, message: str, user_id: UUID):
+    async def send_user_message(self, message: Dict[str, Any], user_id: UUID):
         """Send a message to all connections for a user."""
-        if user_id in self.user_connections:
-            for connection_id in self.user_connections[user_id].copy():
-                try:
-                    await self.send_personal_message(message, connection_id)
-                except:
-                    # Connection is broken, remove it
-                    self.disconnect(user_id, connection_id)
+        user_connections = self.user_connections.get(user_id.int)
+        if not user_connections:
+            return
+        
+        # Snapshot, since sends can yield to connects and disconnects
+        connections = tuple(user_connections.values())
+        await self._send_all(
+            message,
+            tuple(user_connections),
+            tuple(connection.websocket for connection in connections),
+            tuple(connection.use_msgpack for connection in connections),
+        )
     
-    async def broadcast(self, message: str):
+    async def broadcast(self, message: Dict[str, Any]):
         """Broadcast a message to all connected clients."""
-        for connection_id, websocket in self.active_connections.copy().items():
-            try:
-                await websocket.send_text(message)
-            except:
-                # Connection is broken, clean up
-                # Find and remove from user_connections
-                for user_id, conn_ids in self.user_connections.items():
-                    if connection_id in conn_ids:
-                        self.disconnect(user_id, connection_id)
-                        break
+        if not self._websockets:
+            return
+        
+        # Copy so connects and disconnects during the sends don't shift entries
+        await self._send_all(
+            message, self._connection_keys[:], self._websockets[:], self._use_msgpack[:]
+        )
+    
+    async def _send_all(
+        self,
+        message: Dict[str, Any],
+        connection_keys: Sequence[int],
+        websockets: Sequence[WebSocket],
+        use_msgpack: Sequence[bool],
+    ):
+        """Send to every connection concurrently so one slow client doesn't delay the rest.
+        
+        The message is serialized at most once per framing.
+        """
+        text_frame = _dumps(message) if not all(use_msgpack) else None
+        binary_frame = _packb(message) if any(use_msgpack) else None
+        results = await asyncio.gather(
+            *(
+                websocket.send_bytes(binary_frame) if binary else websocket.send_text(text_frame)
+                for websocket, binary in zip(websockets, use_msgpack, strict=True)
+            ),
+            return_exceptions=True,
+        )
+        
+        dead_keys = []
+        for connection_key, result in zip(connection_keys, results, strict=True):
+            if result is None:
+                continue
+            if isinstance(result, _SEND_ERRORS):
+                # Connection is broken, remove it
+                dead_keys.append(connection_key)
+            else:
+                # Anything else is a bug rather than a dropped client; log it
+                # instead of failing the sender over someone else's socket
+                connection = self.active_connections.get(connection_key)
+                logger.error(
+                    "WebSocket send failed",
+                    connection_id=connection.connection_id_str if connection else None,
+                    exc_info=result,
+                )
+        
+        for connection_key in dead_keys:
+            self._remove(connection_key)
 
 
 # Global connection manager
 manager = ConnectionManager()
 
 
+@functools.lru_cache(maxsize=4096)
+def _verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a token once; reconnects with the same token skip the signature check.
+    
+    The returned payload is shared between callers and must not be modified.
+    Expiry is checked by the caller on every use, and cache_clear() should be
+    called if the signing key is rotated.
+    """
+    return verify_token(token)
+
+
 async def get_current_user_ws(websocket: WebSocket, token: str = None) -> UUID:
     """Get current user from WebSocket token."""
     if not token:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Token required")
     
-    payload = verify_token(token)
-    if not payload:
+    payload = _verify_token_cached(token)
+    if not payload or payload.get("exp", 0) <= time.time():
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token")
     
@@ -105,6 +281,69 @@ async def get_current_user_ws(websocket: WebSocket, token: str = None) -> UUID:
         raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid user ID")
 
 
+async def _handle_ping(websocket: WebSocket, user_id: UUID, message_data: Dict[str, Any]):
+    """Respond to ping."""
+    await websocket.send_text(_PONG_FRAME_PREFIX + _now_iso() + _PONG_FRAME_SUFFIX)
+
+
+async def _handle_task_update(websocket: WebSocket, user_id: UUID, message_data: Dict[str, Any]):
+    """Broadcast a task update to the user's other connections."""
+    update_notification = {
+        "type": "task_updated",
+        "data": message_data.get("data", {}),
+        "timestamp": _now_iso(),
+    }
+    await manager.send_user_message(update_notification, user_id)
+
+
+async def _handle_note_update(websocket: WebSocket, user_id: UUID, message_data: Dict[str, Any]):
+    """Broadcast a note update to the user's other connections."""
+    update_notification = {
+        "type": "note_updated",
+        "data": message_data.get("data", {}),
+        "timestamp": _now_iso(),
+    }
+    await manager.send_user_message(update_notification, user_id)
+
+
+async def _handle_typing(websocket: WebSocket, user_id: UUID, message_data: Dict[str, Any]):
+    """Relay a typing indicator."""
+    typing_data = message_data.get("data", {})
+    
+    typing_notification = {
+        "type": "user_typing",
+        "data": {
+            "user_id": str(user_id),
+            "is_typing": typing_data.get("is_typing", False),
+            "context": typing_data.get("context", "")
+        },
+        "timestamp": _now_iso(),
+    }
+    
+    # In a real app, you might broadcast to specific rooms/channels
+    await manager.send_user_message(typing_notification, user_id)
+
+
+async def _handle_unknown(websocket: WebSocket, user_id: UUID, message_data: Dict[str, Any]):
+    """Report an unknown message type."""
+    error_response = {
+        "type": "error",
+        "message": f"Unknown message type: {message_data.get('type')}"
+    }
+    await websocket.send_text(_dumps(error_response))
+
+
+MessageHandler = Callable[[WebSocket, UUID, Dict[str, Any]], Awaitable[None]]
+
+# Handlers for the message types clients can send
+_MESSAGE_HANDLERS: Dict[str, MessageHandler] = {
+    "ping": _handle_ping,
+    "task_update": _handle_task_update,
+    "note_update": _handle_note_update,
+    "typing": _handle_typing,
+}
+
+
 @router.websocket("/connect")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -118,106 +357,44 @@ async def websocket_endpoint(
         user_id = await get_current_user_ws(websocket, token)
         
         # Generate connection ID
-        from uuid import uuid4
         connection_id = uuid4()
         
         # Connect
         await manager.connect(websocket, user_id, connection_id)
         
-        # Send welcome message
-        welcome_message = {
-            "type": "connected",
-            "message": "Successfully connected to Full-Stack Python Kit WebSocket",
-            "connection_id": str(connection_id),
-            "user_id": str(user_id),
-        }
-        await websocket.send_text(json.dumps(welcome_message))
-        
         try:
+            # Send welcome message
+            welcome_message = {
+                "type": "connected",
+                "message": "Successfully connected to Full-Stack Python Kit WebSocket",
+                "connection_id": str(connection_id),
+                "user_id": str(user_id),
+            }
+            await websocket.send_text(_dumps(welcome_message))
+            
             while True:
                 # Receive message from client
                 data = await websocket.receive_text()
                 
                 try:
-                    message_data = json.loads(data)
-                except json.JSONDecodeError:
-                    error_response = {
-                        "type": "error",
-                        "message": "Invalid JSON format"
-                    }
-                    await websocket.send_text(json.dumps(error_response))
+                    message_data = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    message_data = None
+                
+                # Messages are JSON objects; reject anything else
+                if not isinstance(message_data, dict):
+                    await websocket.send_text(_INVALID_JSON_FRAME)
                     continue
                 
-                # Handle different message types
+                # Dispatch on the message type
                 message_type = message_data.get("type")
-                
-                if message_type == "ping":
-                    # Respond to ping
-                    pong_response = {
-                        "type": "pong",
-                        "timestamp": "2025-01-13T00:00:00Z"  # Would use actual timestamp
-                    }
-                    await websocket.send_text(json.dumps(pong_response))
-                
-                elif message_type == "task_update":
-                    # Handle task update notifications
-                    task_data = message_data.get("data", {})
-                    
-                    # Broadcast to user's other connections
-                    update_notification = {
-                        "type": "task_updated",
-                        "data": task_data,
-                        "timestamp": "2025-01-13T00:00:00Z"
-                    }
-                    await manager.send_user_message(
-                        json.dumps(update_notification), 
-                        user_id
-                    )
-                
-                elif message_type == "note_update":
-                    # Handle note update notifications
-                    note_data = message_data.get("data", {})
-                    
-                    # Broadcast to user's other connections
-                    update_notification = {
-                        "type": "note_updated",
-                        "data": note_data,
-                        "timestamp": "2025-01-13T00:00:00Z"
-                    }
-                    await manager.send_user_message(
-                        json.dumps(update_notification), 
-                        user_id
-                    )
-                
-                elif message_type == "typing":
-                    # Handle typing indicators
-                    typing_data = message_data.get("data", {})
-                    
-                    typing_notification = {
-                        "type": "user_typing",
-                        "data": {
-                            "user_id": str(user_id),
-                            "is_typing": typing_data.get("is_typing", False),
-                            "context": typing_data.get("context", "")
-                        },
-                        "timestamp": "2025-01-13T00:00:00Z"
-                    }
-                    
-                    # In a real app, you might broadcast to specific rooms/channels
-                    await manager.send_user_message(
-                        json.dumps(typing_notification), 
-                        user_id
-                    )
-                
-                else:
-                    # Unknown message type
-                    error_response = {
-                        "type": "error",
-                        "message": f"Unknown message type: {message_type}"
-                    }
-                    await websocket.send_text(json.dumps(error_response))
+                handler = _MESSAGE_HANDLERS.get(message_type, _handle_unknown)
+                await handler(websocket, user_id, message_data)
                 
         except WebSocketDisconnect:
+            pass
+        finally:
+            # Also on errors, so the manager never keeps a dead socket
             manager.disconnect(user_id, connection_id)
             
     except WebSocketException:
@@ -227,7 +404,8 @@ async def websocket_endpoint(
         logger.error("WebSocket error", error=str(e), exc_info=True)
         try:
             await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
-        except:
+        except _SEND_ERRORS:
+            # Socket already closed
             pass
 
 
@@ -248,20 +426,19 @@ async def user_notifications(
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
         
-        from uuid import uuid4
         connection_id = uuid4()
         
         await manager.connect(websocket, user_id, connection_id)
         
-        # Send initial notification
-        initial_message = {
-            "type": "notifications_connected",
-            "message": "Connected to notification stream",
-            "user_id": str(user_id),
-        }
-        await websocket.send_text(json.dumps(initial_message))
-        
         try:
+            # Send initial notification
+            initial_message = {
+                "type": "notifications_connected",
+                "message": "Connected to notification stream",
+                "user_id": str(user_id),
+            }
+            await websocket.send_text(_dumps(initial_message))
+            
             while True:
                 # Keep connection alive and handle any incoming messages
                 data = await websocket.receive_text()
@@ -270,11 +447,14 @@ async def user_notifications(
                 echo_response = {
                     "type": "echo",
                     "data": data,
-                    "timestamp": "2025-01-13T00:00:00Z"
+                    "timestamp": _now_iso(),
                 }
-                await websocket.send_text(json.dumps(echo_response))
+                await websocket.send_text(_dumps(echo_response))
                 
         except WebSocketDisconnect:
+            pass
+        finally:
+            # Also on errors, so the manager never keeps a dead socket
             manager.disconnect(user_id, connection_id)
             
     except WebSocketException:
@@ -283,7 +463,8 @@ async def user_notifications(
         logger.error("Notification WebSocket error", error=str(e), exc_info=True)
         try:
             await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
-        except:
+        except _SEND_ERRORS:
+            # Socket already closed
             pass
 
 
@@ -293,7 +474,7 @@ async def send_notification(user_id: UUID, notification_type: str, data: dict):
     notification = {
         "type": notification_type,
         "data": data,
-        "timestamp": "2025-01-13T00:00:00Z"
+        "timestamp": _now_iso(),
     }
     
-    await manager.send_user_message(json.dumps(notification), user_id)
\ No newline at end of file
+    await manager.send_user_message(notification, user_id)
\ No newline at end of file
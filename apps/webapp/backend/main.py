@@ -8,23 +8,20 @@ of the Full-Stack Python Kit with FastAPI, SQLModel, and modern Python patterns.
 
 import asyncio
 from contextlib import asynccontextmanager
+from importlib.util import find_spec
 from typing import Dict, Any
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from sqlalchemy.ext.asyncio import AsyncSession
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
 from packages.core.config import get_settings
 from packages.core.logging import configure_logging, get_logger
-from packages.database.session import create_db_and_tables, get_db
+from packages.auth.password import get_pwd_context
+from packages.database.session import create_db_and_tables, ping_database
 from app.api import api_router
-from app.monitoring import setup_monitoring
+from app.monitoring import preallocate_route_metrics, setup_monitoring
 
 # Configure logging
 configure_logging()
@@ -38,7 +35,11 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    logger.info("Starting up Full-Stack Python Kit API", version=settings.app_version)
+    logger.info(
+        "Starting up Full-Stack Python Kit API",
+        version=settings.app_version,
+        event_loop=type(asyncio.get_running_loop()).__module__,
+    )
     
     # Initialize database
     try:
@@ -48,8 +49,12 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to create database tables", error=str(e))
         raise
     
-    # Setup monitoring
-    setup_monitoring(app)
+    # Pick the password hashing cost now rather than on the first login
+    pwd_context = get_pwd_context()
+    logger.info("Password hashing configured", scheme=pwd_context.default_scheme())
+    
+    # All routes are registered by now
+    preallocate_route_metrics(app)
     
     yield
     
@@ -57,15 +62,25 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Full-Stack Python Kit API")
 
 
-# Initialize Sentry if DSN is provided
+# Initialize Sentry if DSN is provided (the SDK is only imported when enabled)
 if settings.sentry_dsn:
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+    
+    integrations = [FastApiIntegration(transaction_style="endpoint")]
+    # Per-statement spans are only worth their cost in production
+    if settings.environment == "production":
+        integrations.append(SqlalchemyIntegration())
+    
     sentry_sdk.init(
         dsn=settings.sentry_dsn,
-        integrations=[
-            FastApiIntegration(auto_enabling_integrations=False),
-            SqlalchemyIntegration(),
-        ],
-        traces_sample_rate=1.0 if settings.debug else 0.1,
+        integrations=integrations,
+        auto_enabling_integrations=False,
+        traces_sample_rate=settings.sentry_traces_sample_rate,
+        profiles_sample_rate=0.0,
+        send_default_pii=False,
+        max_breadcrumbs=20,
         environment=settings.environment,
     )
 
@@ -143,11 +158,12 @@ async def general_exception_handler(request: Request, exc: Exception):
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests."""
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
     
     response = await call_next(request)
     
-    process_time = asyncio.get_event_loop().time() - start_time
+    process_time = loop.time() - start_time
     
     logger.info(
         "Request processed",
@@ -161,6 +177,9 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# Setup monitoring (middleware and metrics endpoints)
+setup_monitoring(app)
+
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
@@ -192,11 +211,11 @@ async def root() -> Dict[str, Any]:
 
 # Health check endpoint
 @app.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+async def health_check() -> Dict[str, Any]:
     """Health check endpoint."""
     try:
-        # Test database connection
-        await db.execute("SELECT 1")
+        # Test database connection without setting up a session
+        await ping_database()
         db_status = "healthy"
     except Exception as e:
         logger.error("Database health check failed", error=str(e))
@@ -216,12 +235,17 @@ def main():
     """Run the development server."""
     import uvicorn
     
+    # uvloop and httptools come with uvicorn[standard] except on Windows
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # uvicorn can't reload with multiple workers
+        workers=1 if settings.debug else settings.workers,
         log_level="debug" if settings.debug else "info",
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
     )
 
 
@@ -0,0 +1,71 @@
+"""Convert note tags from a JSON string to a text array
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tags_is_array() -> bool:
+    """Whether note.tags is already an array (e.g. the app created the table)."""
+    columns = sa.inspect(op.get_bind()).get_columns("note")
+    return any(
+        column["name"] == "tags" and isinstance(column["type"], postgresql.ARRAY)
+        for column in columns
+    )
+
+
+def upgrade() -> None:
+    # SQLite keeps tags as JSON text, which the old JSON strings already are
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    if not _tags_is_array():
+        # ALTER COLUMN ... USING can't contain a subquery, so convert through
+        # a new column. Elements are trimmed and kept only if they are valid
+        # tags (1-50 characters); non-array values and empty arrays become NULL.
+        op.add_column("note", sa.Column("tags_array", postgresql.ARRAY(sa.Text())))
+        op.execute(
+            """
+            UPDATE note SET tags_array = CASE
+                WHEN btrim(tags) LIKE '[%' THEN NULLIF(
+                    ARRAY(
+                        SELECT btrim(tag)
+                        FROM json_array_elements_text(tags::json) AS tag
+                        WHERE length(btrim(tag)) BETWEEN 1 AND 50
+                    ),
+                    '{}'
+                )
+            END
+            WHERE tags IS NOT NULL
+            """
+        )
+        op.drop_column("note", "tags")
+        op.alter_column("note", "tags_array", new_column_name="tags")
+    
+    op.create_index(
+        "note_tags_gin", "note", ["tags"], postgresql_using="gin", if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.drop_index("note_tags_gin", table_name="note", if_exists=True)
+    
+    op.add_column("note", sa.Column("tags_json", sa.String()))
+    op.execute("UPDATE note SET tags_json = array_to_json(tags)::text WHERE tags IS NOT NULL")
+    op.drop_column("note", "tags")
+    op.alter_column("note", "tags_json", new_column_name="tags")
@@ -0,0 +1,39 @@
+"""Add per-user listing indexes
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = '0000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables are created by the application on startup, which also creates
+    # these indexes for new databases; this brings existing ones up to date.
+    op.create_index(
+        "notes_user_updated_idx", "note", ["user_id", sa.text("updated_at DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "tasks_user_created_idx", "task", ["user_id", sa.text("created_at DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "tasks_user_completed_priority_idx", "task", ["user_id", "completed", "priority"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("tasks_user_completed_priority_idx", table_name="task", if_exists=True)
+    op.drop_index("tasks_user_created_idx", table_name="task", if_exists=True)
+    op.drop_index("notes_user_updated_idx", table_name="note", if_exists=True)
@@ -0,0 +1,37 @@
+"""Add note full-text search index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only PostgreSQL has tsvector; other databases fall back to LIKE
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.create_index(
+        "notes_tsv_idx",
+        "note",
+        [sa.text("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))")],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.drop_index("notes_tsv_idx", table_name="note", if_exists=True)
@@ -2,7 +2,15 @@
 Authentication and authorization utilities for the Full-Stack Python Kit.
 """
 
-from .auth import get_current_user, create_access_token
-from .password import verify_password, hash_password
+from .auth import get_current_user, create_access_token, invalidate_cached_user
+from .password import verify_password, hash_password, verify_password_async, hash_password_async
 
-__all__ = ["get_current_user", "create_access_token", "verify_password", "hash_password"]
\ No newline at end of file
+__all__ = [
+    "get_current_user",
+    "create_access_token",
+    "invalidate_cached_user",
+    "verify_password",
+    "hash_password",
+    "verify_password_async",
+    "hash_password_async",
+]
\ No newline at end of file
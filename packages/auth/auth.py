@@ -2,8 +2,9 @@
 Authentication utilities and JWT token handling.
 """
 
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
@@ -22,6 +23,12 @@ security = HTTPBearer()
 # Get settings
 settings = get_settings()
 
+# Recently authenticated users by ID, with their expiry (monotonic seconds).
+# Entries are detached copies: the loaded instance belongs to one request's
+# session, which expires it on rollback and detaches it on close.
+_user_cache: Dict[UUID, Tuple[float, User]] = {}
+_USER_CACHE_MAX_SIZE = 10_000
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -47,6 +54,39 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def _get_cached_user(user_id: UUID) -> Optional[User]:
+    """Return a copy of a cached user if its entry has not expired."""
+    entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+    
+    expires_at, user = entry
+    if expires_at < time.monotonic():
+        del _user_cache[user_id]
+        return None
+    
+    # A copy per request, so one handler's changes can't leak into another
+    return User(**user.model_dump())
+
+
+def _cache_user(user: User) -> None:
+    """Cache an authenticated user for settings.user_cache_ttl_seconds."""
+    if settings.user_cache_ttl_seconds <= 0:
+        return
+    
+    if len(_user_cache) >= _USER_CACHE_MAX_SIZE:
+        # Evict the oldest entry; dicts keep insertion order
+        del _user_cache[next(iter(_user_cache))]
+    
+    snapshot = User(**user.model_dump())
+    _user_cache[user.id] = (time.monotonic() + settings.user_cache_ttl_seconds, snapshot)
+
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """Drop a user from the authentication cache after it changes."""
+    _user_cache.pop(user_id, None)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -74,6 +114,10 @@ async def get_current_user(
     except ValueError:
         raise credentials_exception
     
+    user = _get_cached_user(user_id)
+    if user is not None:
+        return user
+    
     # Get user from database
     statement = select(User).where(User.id == user_id)
     result = await db.execute(statement)
@@ -88,6 +132,7 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    _cache_user(user)
     return user
 
 
@@ -2,17 +2,73 @@
 Password hashing and verification utilities.
 """
 
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from packages.core.config import get_settings
+
+# Get settings
+settings = get_settings()
+
+# Bounds for the calibrated bcrypt cost factor
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+# Bounded pool for hashing so a login storm can't occupy more than one thread per core
+_kdf_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="kdf")
+
 
-# Create password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def calibrate_bcrypt_rounds(target_ms: int) -> int:
+    """Find the smallest bcrypt cost whose hash takes at least target_ms on this host."""
+    for rounds in range(MIN_BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS):
+        start = time.perf_counter()
+        bcrypt.using(rounds=rounds).hash("calibration-password")
+        if (time.perf_counter() - start) * 1000 >= target_ms:
+            return rounds
+    return MAX_BCRYPT_ROUNDS
+
+
+@functools.cache
+def get_pwd_context() -> CryptContext:
+    """Get the password context, calibrating the bcrypt cost on first use."""
+    if settings.password_hash_scheme == "argon2":
+        # Existing bcrypt hashes still verify and are flagged for rehashing
+        return CryptContext(
+            schemes=["argon2", "bcrypt"],
+            deprecated="auto",
+            argon2__type="ID",
+            argon2__time_cost=settings.argon2_time_cost,
+            argon2__memory_cost=settings.argon2_memory_cost,
+            argon2__parallelism=settings.argon2_parallelism,
+        )
+    
+    rounds = settings.bcrypt_rounds or calibrate_bcrypt_rounds(settings.password_hash_target_ms)
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_pwd_context().hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kdf_executor, verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the hashing thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kdf_executor, hash_password, password)
@@ -6,12 +6,18 @@ import sys
 import logging
 from typing import Any, Dict
 
+import orjson
 import structlog
 from structlog.typing import FilteringBoundLogger
 
 from .config import get_settings
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSON serializer for structlog's JSONRenderer, backed by orjson."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
 def configure_logging() -> None:
     """Configure structured logging for the application."""
     settings = get_settings()
@@ -32,7 +38,7 @@ def configure_logging() -> None:
             # Format exception info if available
             structlog.processors.format_exc_info,
             # Render the final event dict as JSON if in production
-            structlog.processors.JSONRenderer() if settings.environment == "production"
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps) if settings.environment == "production"
             else structlog.dev.ConsoleRenderer(colors=True),
         ],
         context_class=dict,
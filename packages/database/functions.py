@@ -0,0 +1,84 @@
+"""
+Custom SQL functions compiled per database dialect.
+"""
+
+from sqlalchemy import Boolean, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import GenericFunction
+
+
+class word_count(GenericFunction):
+    """Number of whitespace-separated words in a text expression."""
+    
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(word_count, "postgresql")
+def _word_count_postgresql(element: word_count, compiler: SQLCompiler, **kw) -> str:
+    text = compiler.process(element.clauses, **kw)
+    # Trim, then split on whitespace runs; blank text becomes NULL so it counts as 0
+    return (
+        "coalesce(cardinality(regexp_split_to_array("
+        f"nullif(regexp_replace({text}, '^\\s+|\\s+$', '', 'g'), ''), '\\s+')), 0)"
+    )
+
+
+@compiles(word_count)
+def _word_count_default(element: word_count, compiler: SQLCompiler, **kw) -> str:
+    text = compiler.process(element.clauses, **kw)
+    # Portable approximation: count single spaces between words
+    return (
+        f"(CASE WHEN trim({text}) = '' THEN 0 "
+        f"ELSE length(trim({text})) - length(replace(trim({text}), ' ', '')) + 1 END)"
+    )
+
+
+class has_tag(GenericFunction):
+    """True when a note's tag array contains the given tag."""
+    
+    type = Boolean()
+    inherit_cache = True
+
+
+@compiles(has_tag, "postgresql")
+def _has_tag_postgresql(element: has_tag, compiler: SQLCompiler, **kw) -> str:
+    tags, tag = (compiler.process(clause, **kw) for clause in element.clauses)
+    # Containment (rather than = ANY) is the form the GIN index can serve
+    return f"({tags} @> ARRAY[CAST({tag} AS TEXT)])"
+
+
+@compiles(has_tag, "sqlite")
+def _has_tag_sqlite(element: has_tag, compiler: SQLCompiler, **kw) -> str:
+    tags, tag = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"EXISTS (SELECT 1 FROM json_each({tags}) WHERE json_each.value = {tag})"
+
+
+class text_search(GenericFunction):
+    """True when a note's title or content matches a free-text query."""
+    
+    type = Boolean()
+    inherit_cache = True
+
+
+@compiles(text_search, "postgresql")
+def _text_search_postgresql(element: text_search, compiler: SQLCompiler, **kw) -> str:
+    title, content, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    # Must match the notes_tsv_idx expression in models.py for the index to be used
+    return (
+        f"(to_tsvector('simple', coalesce({title}, '') || ' ' || coalesce({content}, '')) "
+        f"@@ plainto_tsquery('simple', {query}))"
+    )
+
+
+@compiles(text_search)
+def _text_search_default(element: text_search, compiler: SQLCompiler, **kw) -> str:
+    title, content, query = element.clauses
+    # Portable fallback: case-insensitive substring match. The query is
+    # compiled once per use so positional bind parameters line up.
+    matches = [
+        f"lower({compiler.process(column, **kw)}) LIKE '%' || lower({compiler.process(query, **kw)}) || '%'"
+        for column in (title, content)
+    ]
+    return f"({' OR '.join(matches)})"
@@ -3,9 +3,12 @@ Database models using SQLModel.
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID, uuid4
 
+from sqlalchemy import JSON, Column, Index, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from pydantic import constr
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -48,6 +51,12 @@ class Task(TimestampMixin, table=True):
     
     # Relationships
     user: User = Relationship(back_populates="tasks")
+    
+    __table_args__ = (
+        # Serves the per-user listing, newest first
+        Index("tasks_user_created_idx", "user_id", text("created_at DESC")),
+        Index("tasks_user_completed_priority_idx", "user_id", "completed", "priority"),
+    )
 
 
 class Note(TimestampMixin, table=True):
@@ -56,13 +65,29 @@ class Note(TimestampMixin, table=True):
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     title: str = Field(nullable=False)
     content: str = Field(nullable=False)
-    tags: Optional[str] = Field(default=None)  # JSON string of tags
+    # Native text array on PostgreSQL; SQLite (tests) stores a JSON array
+    tags: Optional[List[str]] = Field(
+        default=None,
+        sa_column=Column(ARRAY(Text()).with_variant(JSON(none_as_null=True), "sqlite")),
+    )
     
     # Foreign key
     user_id: UUID = Field(foreign_key="user.id", nullable=False)
     
     # Relationships
     user: User = Relationship(back_populates="notes")
+    
+    __table_args__ = (
+        # Serves the per-user listing, most recently updated first
+        Index("notes_user_updated_idx", "user_id", text("updated_at DESC")),
+        Index("note_tags_gin", "tags", postgresql_using="gin"),
+        # Full-text search; the expression matches text_search() in functions.py
+        Index(
+            "notes_tsv_idx",
+            text("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
 
 class APIKey(TimestampMixin, table=True):
@@ -80,6 +105,12 @@ class APIKey(TimestampMixin, table=True):
 
 # Pydantic models for API
 
+# A single note tag, validated once when the request body is parsed
+Tag = constr(strip_whitespace=True, min_length=1, max_length=50)
+
+# Task priority levels
+Priority = Literal["low", "medium", "high"]
+
 class UserBase(SQLModel):
     """Base user schema."""
     email: str
@@ -115,7 +146,7 @@ class TaskBase(SQLModel):
     title: str
     description: Optional[str] = None
     completed: bool = False
-    priority: str = "medium"
+    priority: Priority = "medium"
     due_date: Optional[datetime] = None
 
 
@@ -137,7 +168,7 @@ class TaskUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
     completed: Optional[bool] = None
-    priority: Optional[str] = None
+    priority: Optional[Priority] = None
     due_date: Optional[datetime] = None
 
 
@@ -145,7 +176,7 @@ class NoteBase(SQLModel):
     """Base note schema."""
     title: str
     content: str
-    tags: Optional[str] = None
+    tags: Optional[List[Tag]] = None
 
 
 class NoteCreate(NoteBase):
@@ -165,4 +196,4 @@ class NoteUpdate(SQLModel):
     """Note update schema."""
     title: Optional[str] = None
     content: Optional[str] = None
-    tags: Optional[str] = None
\ No newline at end of file
+    tags: Optional[List[Tag]] = None
\ No newline at end of file
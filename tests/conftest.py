@@ -1,35 +1,81 @@
 """Pytest configuration and fixtures for Full-Stack Python Kit tests."""
 
-import asyncio
+import hashlib
+import os
 import pytest
 import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 from typing import AsyncGenerator, Generator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel
 from fastapi.testclient import TestClient
 
-from packages.core.config import get_settings
+# Test database URL; in-memory, so no file I/O between tests and every xdist
+# worker process gets a database of its own
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+# Configure the app through the environment before anything reads settings;
+# the app's engine is built from them on import, so a DATABASE_URL set any
+# later would leave xdist workers sharing whatever it pointed at
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["DEBUG"] = "true"
+# Skip bcrypt cost calibration and hash at the minimum cost
+# (MIN_BCRYPT_ROUNDS) where real hashing is still used
+os.environ["BCRYPT_ROUNDS"] = "10"
+
 from packages.database.session import get_db
 from packages.database.models import User
-from packages.auth.password import hash_password
+from packages.auth import auth, password
 from apps.webapp.backend.main import app
 
-# Test database URL
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-
-# Override settings for testing
-settings = get_settings()
-settings.database_url = TEST_DATABASE_URL
-settings.secret_key = "test-secret-key"
-settings.debug = True
-
-# Create test engine
+# Create test engine; StaticPool hands out one shared connection so the
+# in-memory database (and its schema) outlives any single session
 test_engine = create_async_engine(
     TEST_DATABASE_URL,
     echo=False,
+    poolclass=StaticPool,
     connect_args={"check_same_thread": False}
 )
 
+
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit
+# BEGIN itself so each test can run inside a transaction that is rolled back
+@event.listens_for(test_engine.sync_engine, "connect")
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+# Durability is pointless for a throwaway database; these also cover
+# pointing TEST_DATABASE_URL at a file
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
+
+@event.listens_for(test_engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 TestSessionLocal = async_sessionmaker(
     test_engine,
     class_=AsyncSession,
@@ -37,106 +83,179 @@ TestSessionLocal = async_sessionmaker(
 )
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def _fast_hash_password(plain_password: str) -> str:
+    return "sha256$" + hashlib.sha256(plain_password.encode()).hexdigest()
+
 
+def _fast_verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hashed_password == _fast_hash_password(plain_password)
 
-@pytest_asyncio.fixture
-async def test_db() -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async with test_engine.begin() as conn:
+
+@pytest.fixture(autouse=True)
+def _fast_hash(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Swap the deliberately slow password KDF for SHA-256.
+    
+    The async wrappers look these up at call time, so the API is covered too.
+    Tests marked real_crypto keep the real implementation.
+    """
+    if request.node.get_closest_marker("real_crypto"):
+        return
+    
+    monkeypatch.setattr(password, "hash_password", _fast_hash_password)
+    monkeypatch.setattr(password, "verify_password", _fast_verify_password)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def db_connection() -> AsyncGenerator[AsyncConnection, None]:
+    """Open the test database connection and create the schema, once per session."""
+    async with test_engine.connect() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.commit()
+        
+        yield conn
+    
+    await test_engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_db(db_connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session whose changes are rolled back afterwards.
+    
+    Commits made by the app release a SAVEPOINT inside the outer transaction
+    instead of ending it, so rows from the session-scoped user fixtures are
+    visible and any changes a test makes to them are undone.
+    """
+    await db_connection.begin()
     
-    async with TestSessionLocal() as session:
+    async with TestSessionLocal(
+        bind=db_connection, join_transaction_mode="create_savepoint"
+    ) as session:
         yield session
     
-    async with test_engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.drop_all)
+    await db_connection.rollback()
+    
+    # The shared users outlive this test, but changes it made to them don't
+    auth._user_cache.clear()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _aclient() -> AsyncGenerator[AsyncClient, None]:
+    """Open an HTTP client that calls the app in-process, once per session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
 
 
 @pytest.fixture
-def client(test_db: AsyncSession) -> TestClient:
-    """Create a test client with database dependency override."""
+def _db_override(
+    db_connection: AsyncConnection, test_db: AsyncSession
+) -> Generator[None, None, None]:
+    """Give each request its own session inside the test's transaction.
+    
+    Requests don't share test_db, so concurrent ones don't queue behind a
+    single session; the savepoints keep their commits inside the rollback.
+    """
     
     async def get_test_db():
-        yield test_db
+        async with TestSessionLocal(
+            bind=db_connection, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
     
     app.dependency_overrides[get_db] = get_test_db
     
+    yield
+    
+    app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def aclient(_aclient: AsyncClient, _db_override: None) -> AsyncGenerator[AsyncClient, None]:
+    """Get the shared async client with database dependency override.
+    
+    Requests run on the test's own loop, so prefer this to the TestClient,
+    which hands every call to a portal thread. WebSocket tests still need
+    the TestClient.
+    """
+    yield _aclient
+    
+    _aclient.cookies.clear()
+
+
+@pytest.fixture(scope="session")
+def _client() -> Generator[TestClient, None, None]:
+    """Start the app once for the whole test session."""
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def client(_client: TestClient, _db_override: None) -> Generator[TestClient, None, None]:
+    """Get the shared test client with database dependency override."""
+    yield _client
     
-    app.dependency_overrides.clear()
+    _client.cookies.clear()
 
 
-@pytest_asyncio.fixture
-async def test_user(test_db: AsyncSession) -> User:
-    """Create a test user."""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_users(db_connection: AsyncConnection) -> tuple[User, User]:
+    """Create the regular and super test users, shared by the whole test session.
+    
+    Both are committed in one go outside any test's transaction, so they
+    survive the per-test rollbacks. All their columns have client-side
+    defaults, so nothing needs refreshing after the insert. They are hashed
+    with the fast stub directly because session fixtures are set up before
+    the function-scoped _fast_hash patch is applied.
+    """
     user = User(
         email="test@example.com",
         username="testuser",
         full_name="Test User",
-        hashed_password=hash_password("testpassword"),
+        hashed_password=_fast_hash_password("testpassword"),
         is_active=True,
         is_verified=True,
     )
-    
-    test_db.add(user)
-    await test_db.commit()
-    await test_db.refresh(user)
-    
-    return user
-
-
-@pytest_asyncio.fixture
-async def test_superuser(test_db: AsyncSession) -> User:
-    """Create a test superuser."""
-    user = User(
+    superuser = User(
         email="admin@example.com",
         username="admin",
         full_name="Admin User",
-        hashed_password=hash_password("adminpassword"),
+        hashed_password=_fast_hash_password("adminpassword"),
         is_active=True,
         is_verified=True,
         is_superuser=True,
     )
     
-    test_db.add(user)
-    await test_db.commit()
-    await test_db.refresh(user)
+    async with TestSessionLocal(bind=db_connection) as session:
+        session.add_all([user, superuser])
+        await session.commit()
     
-    return user
+    return user, superuser
 
 
-@pytest.fixture
-def auth_headers(client: TestClient, test_user: User) -> dict[str, str]:
-    """Create authentication headers for test requests."""
-    login_data = {
-        "username": test_user.username,
-        "password": "testpassword",
-    }
-    
-    response = client.post("/api/v1/auth/login", data=login_data)
-    assert response.status_code == 200
-    
-    token = response.json()["access_token"]
+@pytest.fixture(scope="session")
+def test_user(test_users: tuple[User, User]) -> User:
+    """Get the shared test user."""
+    return test_users[0]
+
+
+@pytest.fixture(scope="session")
+def test_superuser(test_users: tuple[User, User]) -> User:
+    """Get the shared test superuser."""
+    return test_users[1]
+
+
+def _bearer_headers(user: User) -> dict[str, str]:
+    """Build authentication headers with the same token the login endpoint issues."""
+    token = auth.create_access_token({"sub": str(user.id)})
     return {"Authorization": f"Bearer {token}"}
 
 
-@pytest.fixture
-def admin_headers(client: TestClient, test_superuser: User) -> dict[str, str]:
+@pytest.fixture(scope="session")
+def auth_headers(test_user: User) -> dict[str, str]:
+    """Create authentication headers for test requests."""
+    return _bearer_headers(test_user)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(test_superuser: User) -> dict[str, str]:
     """Create admin authentication headers for test requests."""
-    login_data = {
-        "username": test_superuser.username,
-        "password": "adminpassword",
-    }
-    
-    response = client.post("/api/v1/auth/login", data=login_data)
-    assert response.status_code == 200
-    
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
\ No newline at end of file
+    return _bearer_headers(test_superuser)
@@ -1,13 +1,20 @@
 """Integration tests for the FastAPI application."""
 
 import pytest
-from fastapi.testclient import TestClient
+from fastapi.security import HTTPAuthorizationCredentials
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from packages.auth.auth import create_access_token, get_current_user
 from packages.database.models import User
+from app.routes import auth as auth_routes
 
+# Run on the same loop as the shared database connection and client
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-def test_root_endpoint(client: TestClient):
+
+async def test_root_endpoint(aclient: AsyncClient):
     """Test the root endpoint."""
-    response = client.get("/")
+    response = await aclient.get("/")
     assert response.status_code == 200
     
     data = response.json()
@@ -16,9 +23,9 @@ def test_root_endpoint(client: TestClient):
     assert data["message"] == "Welcome to the Full-Stack Python Kit API"
 
 
-def test_health_check(client: TestClient):
+async def test_health_check(aclient: AsyncClient):
     """Test the health check endpoint."""
-    response = client.get("/health")
+    response = await aclient.get("/health")
     assert response.status_code == 200
     
     data = response.json()
@@ -27,39 +34,59 @@ def test_health_check(client: TestClient):
     assert "database" in data
 
 
-def test_login_endpoint(client: TestClient, test_user: User):
-    """Test user login."""
-    login_data = {
-        "username": test_user.username,
-        "password": "testpassword",
-    }
+async def test_metrics_endpoint(aclient: AsyncClient):
+    """Test the Prometheus metrics endpoint."""
+    await aclient.get("/")
     
-    response = client.post("/api/v1/auth/login", data=login_data)
+    response = await aclient.get("/metrics")
     assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{endpoint="/"' in response.text
+    assert 'endpoint="/metrics"' not in response.text
+
+
+async def test_metrics_unmatched_paths_share_label(aclient: AsyncClient):
+    """Test that unknown paths don't create one metric series each."""
+    await aclient.get("/no-such-page-1")
+    await aclient.get("/no-such-page-2")
     
-    data = response.json()
-    assert "access_token" in data
-    assert "token_type" in data
-    assert data["token_type"] == "bearer"
-    assert "user" in data
-    assert data["user"]["email"] == test_user.email
+    response = await aclient.get("/metrics")
+    assert 'endpoint="<unmatched>"' in response.text
+    assert "no-such-page" not in response.text
 
 
-def test_login_invalid_credentials(client: TestClient):
-    """Test login with invalid credentials."""
+@pytest.mark.parametrize(
+    "username, password, expected_status",
+    [
+        ("testuser", "testpassword", 200),
+        ("nonexistent", "wrongpassword", 401),
+    ],
+)
+async def test_login(
+    aclient: AsyncClient, test_user: User, username: str, password: str, expected_status: int
+):
+    """Test user login with valid and invalid credentials."""
     login_data = {
-        "username": "nonexistent",
-        "password": "wrongpassword",
+        "username": username,
+        "password": password,
     }
     
-    response = client.post("/api/v1/auth/login", data=login_data)
-    assert response.status_code == 401
+    response = await aclient.post("/api/v1/auth/login", data=login_data)
+    assert response.status_code == expected_status
     
     data = response.json()
-    assert "detail" in data
+    if expected_status != 200:
+        assert "detail" in data
+        return
+    
+    assert "access_token" in data
+    assert "token_type" in data
+    assert data["token_type"] == "bearer"
+    assert "user" in data
+    assert data["user"]["email"] == test_user.email
 
 
-def test_register_endpoint(client: TestClient):
+async def test_register_endpoint(aclient: AsyncClient):
     """Test user registration."""
     user_data = {
         "email": "newuser@example.com",
@@ -68,7 +95,7 @@ def test_register_endpoint(client: TestClient):
         "full_name": "New User",
     }
     
-    response = client.post("/api/v1/auth/register", json=user_data)
+    response = await aclient.post("/api/v1/auth/register", json=user_data)
     assert response.status_code == 200
     
     data = response.json()
@@ -78,25 +105,56 @@ def test_register_endpoint(client: TestClient):
     assert "hashed_password" not in data  # Should not expose password
 
 
-def test_register_duplicate_email(client: TestClient, test_user: User):
-    """Test registration with duplicate email."""
+@pytest.mark.parametrize(
+    "duplicate_field, message",
+    [
+        ("email", "already registered"),
+        ("username", "already taken"),
+    ],
+)
+async def test_register_duplicate(
+    aclient: AsyncClient, test_user: User, duplicate_field: str, message: str
+):
+    """Test registration with an email or username that is already in use."""
     user_data = {
-        "email": test_user.email,  # Duplicate email
+        "email": "other@example.com",
         "username": "newuser",
         "password": "newpassword123",
     }
+    user_data[duplicate_field] = getattr(test_user, duplicate_field)
     
-    response = client.post("/api/v1/auth/register", json=user_data)
+    response = await aclient.post("/api/v1/auth/register", json=user_data)
     assert response.status_code == 400
     
     data = response.json()
     assert "detail" in data
-    assert "already registered" in data["detail"].lower()
+    assert message in data["detail"].lower()
 
 
-def test_get_current_user(client: TestClient, auth_headers: dict[str, str]):
+@pytest.mark.parametrize("upsert", [True, False], ids=["on-conflict", "fallback"])
+async def test_register_duplicate_race(
+    aclient: AsyncClient, test_user: User, monkeypatch: pytest.MonkeyPatch, upsert: bool
+):
+    """Test a duplicate that the pre-check misses, as when a concurrent request wins."""
+    checks = iter([None])
+    original_check = auth_routes._registration_conflict
+    
+    async def racing_check(db, user_data):
+        return next(checks, None) or await original_check(db, user_data)
+    
+    monkeypatch.setattr(auth_routes, "_registration_conflict", racing_check)
+    if not upsert:
+        monkeypatch.setattr(auth_routes, "_UPSERT_INSERTS", {})
+    
+    user_data = {"email": test_user.email, "username": "newuser", "password": "newpassword123"}
+    response = await aclient.post("/api/v1/auth/register", json=user_data)
+    assert response.status_code == 400
+    assert "already registered" in response.json()["detail"].lower()
+
+
+async def test_get_current_user(aclient: AsyncClient, auth_headers: dict[str, str]):
     """Test getting current user information."""
-    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    response = await aclient.get("/api/v1/auth/me", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -105,14 +163,184 @@ def test_get_current_user(client: TestClient, auth_headers: dict[str, str]):
     assert "id" in data
 
 
-def test_unauthorized_access(client: TestClient):
+async def test_unauthorized_access(aclient: AsyncClient):
     """Test accessing protected endpoint without authentication."""
-    response = client.get("/api/v1/auth/me")
+    response = await aclient.get("/api/v1/auth/me")
     assert response.status_code == 401
 
 
-def test_invalid_token(client: TestClient):
+async def test_invalid_token(aclient: AsyncClient):
     """Test accessing protected endpoint with invalid token."""
     headers = {"Authorization": "Bearer invalid-token"}
-    response = client.get("/api/v1/auth/me", headers=headers)
-    assert response.status_code == 401
\ No newline at end of file
+    response = await aclient.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+
+
+async def test_task_stats(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test task statistics aggregation."""
+    tasks = [
+        {"title": "Low", "priority": "low"},
+        {"title": "High", "priority": "high"},
+        {"title": "High done", "priority": "high", "completed": True},
+    ]
+    for task in tasks:
+        response = await aclient.post("/api/v1/tasks/", json=task, headers=auth_headers)
+        assert response.status_code == 200
+    
+    response = await aclient.get("/api/v1/tasks/stats/summary", headers=auth_headers)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["total_tasks"] == 3
+    assert data["completed_tasks"] == 1
+    assert data["pending_tasks"] == 2
+    assert data["low_priority"] == 1
+    assert data["medium_priority"] == 0
+    assert data["high_priority"] == 1
+
+
+async def test_toggle_task(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test toggling a task's completion status back and forth."""
+    response = await aclient.post("/api/v1/tasks/", json={"title": "Toggle me"}, headers=auth_headers)
+    task_id = response.json()["id"]
+    
+    response = await aclient.post(f"/api/v1/tasks/{task_id}/toggle", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    
+    response = await aclient.post(f"/api/v1/tasks/{task_id}/toggle", headers=auth_headers)
+    assert response.json()["completed"] is False
+
+
+async def test_task_invalid_priority(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test that task priority must be low, medium or high."""
+    task = {"title": "Urgent", "priority": "urgent"}
+    response = await aclient.post("/api/v1/tasks/", json=task, headers=auth_headers)
+    assert response.status_code == 422
+    
+    response = await aclient.get("/api/v1/tasks/", params={"priority": "urgent"}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+async def test_note_stats(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test note statistics aggregation."""
+    notes = [
+        {"title": "Tagged", "content": "one two three", "tags": ["work"]},
+        {"title": "Untagged", "content": "four five"},
+    ]
+    for note in notes:
+        response = await aclient.post("/api/v1/notes/", json=note, headers=auth_headers)
+        assert response.status_code == 200
+    
+    response = await aclient.get("/api/v1/notes/stats/summary", headers=auth_headers)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["total_notes"] == 2
+    assert data["tagged_notes"] == 1
+    assert data["untagged_notes"] == 1
+    assert data["total_words"] == 5
+
+
+
+async def test_note_tags(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test filtering notes by tag and listing distinct tags."""
+    notes = [
+        {"title": "First", "content": "a", "tags": ["work", "ideas"]},
+        {"title": "Second", "content": "b", "tags": ["work"]},
+        {"title": "Third", "content": "c", "tags": ["homework"]},
+    ]
+    for note in notes:
+        response = await aclient.post("/api/v1/notes/", json=note, headers=auth_headers)
+        assert response.status_code == 200
+    
+    response = await aclient.get("/api/v1/notes/", params={"tag": "work"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert sorted(note["title"] for note in response.json()) == ["First", "Second"]
+    
+    response = await aclient.get("/api/v1/notes/tags/list", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == ["homework", "ideas", "work"]
+
+
+async def test_note_invalid_tags(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test that tags must be a list of non-empty strings."""
+    for tags in ('["work"]', [""], ["x" * 51]):
+        note = {"title": "Bad tags", "content": "x", "tags": tags}
+        response = await aclient.post("/api/v1/notes/", json=note, headers=auth_headers)
+        assert response.status_code == 422
+
+
+async def test_current_user_cache_invalidated_on_update(
+    aclient: AsyncClient, auth_headers: dict[str, str], test_user: User
+):
+    """Test that profile changes are visible despite the current-user cache."""
+    response = await aclient.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Test User"
+    
+    response = await aclient.patch(
+        f"/api/v1/users/{test_user.id}", json={"full_name": "Renamed"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    
+    response = await aclient.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Renamed"
+
+
+async def test_current_user_cache_survives_rollback(test_db: AsyncSession, test_user: User):
+    """Test that a cached user outlives the session of the request that loaded it."""
+    token = create_access_token({"sub": str(test_user.id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    await get_current_user(credentials, test_db)
+    
+    # A failed flush rolls the session back, expiring what it loaded
+    await test_db.rollback()
+    test_db.expunge_all()
+    
+    user = await get_current_user(credentials, test_db)
+    assert user.id == test_user.id
+    assert user.username == test_user.username
+
+
+async def test_note_search(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test searching notes by title and content."""
+    notes = [
+        {"title": "Groceries", "content": "milk and eggs"},
+        {"title": "Meeting", "content": "discuss the grocery budget"},
+        {"title": "Ideas", "content": "a new project"},
+    ]
+    for note in notes:
+        response = await aclient.post("/api/v1/notes/", json=note, headers=auth_headers)
+        assert response.status_code == 200
+    
+    response = await aclient.get("/api/v1/notes/", params={"search": "milk"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [note["title"] for note in response.json()] == ["Groceries"]
+    
+    response = await aclient.get("/api/v1/notes/", params={"search": "project"}, headers=auth_headers)
+    assert [note["title"] for note in response.json()] == ["Ideas"]
+
+
+async def test_update_user_duplicate_email(
+    aclient: AsyncClient, auth_headers: dict[str, str], test_user: User, test_superuser: User
+):
+    """Test that a user cannot take another user's email."""
+    response = await aclient.patch(
+        f"/api/v1/users/{test_user.id}", json={"email": test_superuser.email}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert "already registered" in response.json()["detail"].lower()
+
+
+async def test_delete_note(aclient: AsyncClient, auth_headers: dict[str, str]):
+    """Test deleting a note, then deleting it again."""
+    response = await aclient.post(
+        "/api/v1/notes/", json={"title": "Doomed", "content": "x"}, headers=auth_headers
+    )
+    note_id = response.json()["id"]
+    
+    response = await aclient.delete(f"/api/v1/notes/{note_id}", headers=auth_headers)
+    assert response.status_code == 200
+    
+    response = await aclient.delete(f"/api/v1/notes/{note_id}", headers=auth_headers)
+    assert response.status_code == 404
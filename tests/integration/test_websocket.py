@@ -0,0 +1,48 @@
+"""Integration tests for the WebSocket endpoints."""
+
+from datetime import datetime
+
+import msgpack
+from fastapi.testclient import TestClient
+
+
+def test_websocket_messages(client: TestClient, auth_headers: dict[str, str]):
+    """Test the WebSocket welcome, ping and error frames."""
+    token = auth_headers["Authorization"].split()[1]
+    
+    with client.websocket_connect(f"/api/v1/ws/connect?token={token}") as websocket:
+        assert websocket.receive_json()["type"] == "connected"
+        
+        for frame in ('{"type": "ping"}', ' \n{"type": "ping"}'):
+            websocket.send_text(frame)
+            pong = websocket.receive_json()
+            assert pong["type"] == "pong"
+            assert datetime.fromisoformat(pong["timestamp"].replace("Z", "+00:00"))
+        
+        for frame in ("not json", "{broken", "[1, 2]", "null"):
+            websocket.send_text(frame)
+            assert websocket.receive_json() == {"type": "error", "message": "Invalid JSON format"}
+        
+        websocket.send_json({"type": "bogus"})
+        assert websocket.receive_json()["message"] == "Unknown message type: bogus"
+        
+        websocket.send_json({"type": "task_update", "data": {"id": 1}})
+        message = websocket.receive_json()
+        assert message["type"] == "task_updated"
+        assert message["data"] == {"id": 1}
+
+
+def test_websocket_msgpack_subprotocol(client: TestClient, auth_headers: dict[str, str]):
+    """Test that msgpack clients get fan-out messages as binary frames."""
+    token = auth_headers["Authorization"].split()[1]
+    
+    with client.websocket_connect(
+        f"/api/v1/ws/connect?token={token}", subprotocols=["msgpack"]
+    ) as websocket:
+        assert websocket.accepted_subprotocol == "msgpack"
+        assert websocket.receive_json()["type"] == "connected"
+        
+        websocket.send_json({"type": "note_update", "data": {"id": 2}})
+        message = msgpack.unpackb(websocket.receive_bytes())
+        assert message["type"] == "note_updated"
+        assert message["data"] == {"id": 2}
@@ -5,6 +5,7 @@ from packages.auth.password import hash_password, verify_password
 from packages.auth.auth import create_access_token, verify_token
 
 
+@pytest.mark.real_crypto
 def test_password_hashing():
     """Test password hashing and verification."""
     password = "testpassword123"
@@ -50,4 +51,19 @@ def test_jwt_token_with_custom_expiration():
     payload = verify_token(token)
     assert payload is not None
     assert payload["sub"] == "test-user-id"
-    assert "exp" in payload
\ No newline at end of file
+    assert "exp" in payload
+
+
+def test_bcrypt_rounds_calibration():
+    """Test bcrypt cost calibration stays within bounds."""
+    from packages.auth.password import (
+        MAX_BCRYPT_ROUNDS,
+        MIN_BCRYPT_ROUNDS,
+        calibrate_bcrypt_rounds,
+    )
+    
+    # Any hash meets a zero target, so the minimum cost is chosen
+    assert calibrate_bcrypt_rounds(0) == MIN_BCRYPT_ROUNDS
+    
+    rounds = calibrate_bcrypt_rounds(50)
+    assert MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS
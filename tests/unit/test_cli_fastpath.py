@@ -0,0 +1,35 @@
+"""Unit tests for the CLI fast path."""
+
+import pytest
+from apps.cli import fastpath
+from apps.cli.main import app
+
+
+def _run(entry_point, argv, capsys):
+    """Run a CLI entry point and return its exit code and output."""
+    try:
+        entry_point(argv)
+        code = 0
+    except SystemExit as e:
+        code = e.code or 0
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["hello", "Bob"],
+        ["hello", "-uc", "2", "Bob"],
+        ["hello", "--upper", "Bob"],
+        ["hello", "--count", "x"],
+        ["system"],
+        ["system", "inf"],
+    ],
+)
+def test_fast_path_matches_typer(argv, capsys):
+    """Test that the fast path behaves exactly like the Typer app."""
+    fast = _run(fastpath.main, argv, capsys)
+    typer = _run(lambda args: app(args=args, prog_name="fspk-cli"), argv, capsys)
+
+    assert fast == typer
@@ -0,0 +1,39 @@
+"""Unit tests for the WebSocket connection manager."""
+
+from uuid import uuid4
+
+from apps.webapp.backend.app.routes.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    """Just enough of a WebSocket for the manager, failing sends with `error`."""
+
+    def __init__(self, error: Exception = None):
+        self.scope = {}
+        self.error = error
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, message: str):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(message)
+
+
+async def test_broadcast_survives_failing_recipients():
+    """Test that send failures only affect the failing recipients."""
+    manager = ConnectionManager()
+    healthy = FakeWebSocket()
+    closed = FakeWebSocket(RuntimeError("Cannot call send once a close message has been sent"))
+    broken = FakeWebSocket(ValueError("bug"))
+    for websocket in (healthy, closed, broken):
+        await manager.connect(websocket, uuid4(), uuid4())
+
+    await manager.broadcast({"type": "announcement"})
+
+    assert healthy.sent == ['{"type":"announcement"}']
+    # Closed sockets are dropped; other errors are logged, not raised
+    assert [c.websocket for c in manager.active_connections.values()] == [healthy, broken]
+    assert len(manager._websockets) == 2